@@ -1,5 +1,15 @@
+import os
+
 from setuptools import setup, find_packages
 
+# Opt-in: WEBAGENT_MYPYC=1 compiles the pure-Python hot helpers with mypyc.
+# The .py sources ship alongside, so imports fall back to them if the
+# extension is absent.
+ext_modules = []
+if os.environ.get("WEBAGENT_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["webagent/utils.py"])
+
 setup(
     name="webagent",
     version="0.1.0",
@@ -10,5 +20,10 @@ setup(
         "beautifulsoup4>=4.11.0",
         "lxml>=4.9.0",
     ],
+    extras_require={
+        "async": ["httpx[http2]>=0.26.0"],
+        "fast": ["orjson>=3.9.0", "brotli>=1.0.9", "selectolax>=0.3.17", "google-re2>=1.1", "ijson>=3.1"],
+    },
+    ext_modules=ext_modules,
     python_requires=">=3.8",
 )
@@ -1,122 +1,111 @@
-"""WebAgent - AI agent browser automation toolkit."""
-from .search import (
-    SearchResult,
-    SearchBackend,
-    GoogleSearch,
-    DuckDuckGoSearch,
-    BingSearch,
-    search,
-)
+"""WebAgent - AI agent browser automation toolkit.
 
-from .browser import StealthBrowser, BrowserConfig
+Public names are imported lazily (PEP 562): ``import webagent`` is cheap and
+each submodule, with its third-party dependencies, loads on first use.
+"""
+import importlib
+import sys
+import types
 
-from .captcha import (
-    CaptchaSolution,
-    CaptchaSolver,
-    CaptchaProvider,
-    solve_captcha,
-)
-
-from .http import (
-    StealthClient,
-    RequestConfig,
-    ProxyConfig,
-    ProxyPool,
-    get, post, fetch, fetch_json,
-)
-
-from .inspect import (
-    PageInspector,
-    PageStructure,
-    FormField,
-    Link,
-    Image,
-    RequestBuilder,
-)
-
-from .network import (
-    NetworkMonitor,
-    NetworkRequest,
-    NetworkLog,
-    enable_network_monitoring,
-)
-
-from .scrape import (
-    BackgroundScraper,
-    ScrapeJob,
-    scrape_background,
-    spawn_scrape_agent,
-)
-
-from .utils import (
-    random_string,
-    random_email,
-    random_username,
-    parse_url,
-    extract_links,
-    extract_emails,
-    extract_phones,
-    clean_text,
-    retry,
-    rate_limit,
-    Cache,
-    RateLimiter,
-)
-
-__version__ = "0.1.0"
-__all__ = [
+# Public name -> submodule that defines it
+_LAZY = {
     # Search
-    "SearchResult",
-    "SearchBackend",
-    "GoogleSearch",
-    "DuckDuckGoSearch", 
-    "BingSearch",
-    "search",
+    "SearchResult": "search",
+    "SearchBackend": "search",
+    "GoogleSearch": "search",
+    "DuckDuckGoSearch": "search",
+    "BingSearch": "search",
+    "search": "search",
+    "search_race": "search",
     # Browser
-    "StealthBrowser",
-    "BrowserConfig",
+    "StealthBrowser": "browser",
+    "AsyncStealthBrowser": "browser",
+    "BrowserConfig": "browser",
+    "BrowserPool": "browser",
     # Captcha
-    "CaptchaSolution",
-    "CaptchaSolver",
-    "CaptchaProvider",
-    "solve_captcha",
+    "CaptchaSolution": "captcha",
+    "CaptchaSolver": "captcha",
+    "AsyncCaptchaSolver": "captcha",
+    "CaptchaProvider": "captcha",
+    "solve_captcha": "captcha",
     # HTTP Client
-    "StealthClient",
-    "RequestConfig",
-    "ProxyConfig",
-    "ProxyPool",
-    "get",
-    "post", 
-    "fetch",
-    "fetch_json",
+    "StealthClient": "http",
+    "RequestConfig": "http",
+    "ProxyConfig": "http",
+    "ProxyPool": "http",
+    "get": "http",
+    "post": "http",
+    "fetch": "http",
+    "fetch_json": "http",
+    "enable_dns_cache": "http",
+    "disable_dns_cache": "http",
     # Inspection
-    "PageInspector",
-    "PageStructure",
-    "FormField",
-    "Link",
-    "Image",
-    "RequestBuilder",
+    "PageInspector": "inspect",
+    "PageStructure": "inspect",
+    "FormField": "inspect",
+    "Link": "inspect",
+    "Image": "inspect",
+    "RequestBuilder": "inspect",
     # Network
-    "NetworkMonitor",
-    "NetworkRequest",
-    "NetworkLog",
-    "enable_network_monitoring",
+    "NetworkMonitor": "network",
+    "NetworkRequest": "network",
+    "NetworkLog": "network",
+    "enable_network_monitoring": "network",
     # Background Scrape
-    "BackgroundScraper",
-    "ScrapeJob",
-    "scrape_background",
-    "spawn_scrape_agent",
+    "BackgroundScraper": "scrape",
+    "AsyncBackgroundScraper": "scrape",
+    "ScrapeJob": "scrape",
+    "scrape_background": "scrape",
+    "spawn_scrape_agent": "scrape",
     # Utils
-    "random_string",
-    "random_email",
-    "random_username",
-    "parse_url",
-    "extract_links",
-    "extract_emails",
-    "extract_phones",
-    "clean_text",
-    "retry",
-    "rate_limit",
-    "Cache",
-    "RateLimiter",
-]
+    "random_string": "utils",
+    "random_email": "utils",
+    "random_username": "utils",
+    "parse_url": "utils",
+    "parse_urls": "utils",
+    "extract_links": "utils",
+    "extract_emails": "utils",
+    "extract_phones": "utils",
+    "extract_all": "utils",
+    "clean_text": "utils",
+    "retry": "utils",
+    "rate_limit": "utils",
+    "Cache": "utils",
+    "RateLimiter": "utils",
+    "KeyedRateLimiter": "utils",
+}
+
+__version__ = "0.1.0"
+__all__ = tuple(_LAZY)
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module = importlib.import_module(f".{module_name}", __name__)
+    
+    # Bind every export of the module at once; this also restores names that
+    # the submodule import shadows (``webagent.search`` is the function).
+    for public, owner in _LAZY.items():
+        if owner == module_name:
+            globals()[public] = getattr(module, public)
+    
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it on the package; keep the export of the
+        # same name (``webagent.search`` is the function) as eager imports did
+        if isinstance(value, types.ModuleType) and _LAZY.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
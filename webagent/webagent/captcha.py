@@ -1,14 +1,48 @@
 """Captcha solving services."""
 import os
 import time
+import asyncio
+import random
 import base64
+import hmac
+import mmap
+import secrets
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Optional, Dict, Any, Callable, Tuple
 from dataclasses import dataclass
-from urllib.parse import urlencode
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qs
 import json
 
+from .utils import response_json
+
+# Optional: requests-toolbelt streams multipart uploads instead of buffering them
+try:
+    from requests_toolbelt import MultipartEncoder
+    TOOLBELT_AVAILABLE = True
+except ImportError:
+    TOOLBELT_AVAILABLE = False
+
+# Optional: httpx for the asyncio solvers
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+def _b64_file(path: str) -> str:
+    """Base64-encode a file without first reading it into a bytes copy."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return base64.b64encode(mm).decode("ascii")
+
 
 @dataclass
 class CaptchaSolution:
@@ -21,6 +55,77 @@ class CaptchaSolution:
 class CaptchaProvider(ABC):
     """Abstract base class for captcha providers."""
     
+    # Result polling: exponential backoff with jitter between polls
+    poll_initial = 1.0
+    poll_max = 10.0
+    poll_mult = 1.5
+    
+    # Typical solve time (seconds) per captcha kind, used to place the first
+    # poll until this instance has timed real solves of that kind
+    SOLVE_TIME_HINTS = {"image": 5.0, "recaptcha": 20.0, "recaptcha_v3": 15.0, "hcaptcha": 20.0}
+    
+    def _setup_session(self) -> requests.Session:
+        """Create the keep-alive session used for all API calls.
+        
+        Polls reuse one pooled TLS connection instead of handshaking each time.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    def _poll(self, check: Callable[[], Optional[str]], timeout: float = 120, kind: str = None) -> str:
+        """Call check() until it returns a result, backing off between polls.
+        
+        Args:
+            check: Returns the solution, or None while not ready; raises on errors
+            timeout: Seconds before giving up
+            kind: Captcha kind ("image", "recaptcha", ...) for the first-poll hint
+        
+        Returns:
+            The solution returned by check()
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        delay = self._first_delay(kind)
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise Exception("Captcha solve timeout")
+            time.sleep(min(delay * random.uniform(0.7, 1.3), remaining))
+            
+            result = check()
+            if result is not None:
+                self._record_solve(kind, time.monotonic() - start)
+                return result
+            
+            delay = min(self.poll_max, delay * self.poll_mult)
+    
+    def _first_delay(self, kind: str = None) -> float:
+        """Delay before the first poll: half the expected solve time."""
+        expected = self._solve_times.get(kind) or self.SOLVE_TIME_HINTS.get(kind, 0.0)
+        return max(self.poll_initial, expected * 0.5)
+    
+    def _record_solve(self, kind: str, elapsed: float):
+        """Fold an observed solve time into the per-kind estimate."""
+        if kind:
+            previous = self._solve_times.get(kind)
+            self._solve_times[kind] = elapsed if previous is None else 0.7 * previous + 0.3 * elapsed
+    
+    # ============ Context Manager ============
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def close(self):
+        """Close the HTTP session."""
+        self._session.close()
+    
     @abstractmethod
     def solve_image(self, image_path: str = None, image_url: str = None) -> CaptchaSolution:
         """Solve image captcha."""
@@ -37,15 +142,278 @@ class CaptchaProvider(ABC):
         pass
 
 
+class _PendingPoller:
+    """Polls every outstanding 2Captcha task of one API key in one request.
+    
+    Each task waits out its first delay (as in CaptchaProvider._poll); after
+    that, due tasks are polled together by a single
+    ``res.php?action=get&ids=...`` call on one shared, backed-off interval.
+    Batches take the longest-waiting due ids first, so with more than
+    ``MAX_IDS`` tasks the batches rotate through all of them.
+    Shared by all TwoCaptcha instances with the same key; requests go through
+    the session of a solver that is still waiting, never one already closed.
+    """
+    
+    _pollers: Dict[Tuple[str, str], "_PendingPoller"] = {}
+    _pollers_lock = threading.Lock()
+    
+    # 2Captcha accepts up to 100 ids per batched query
+    MAX_IDS = 100
+    
+    @classmethod
+    def for_provider(cls, provider: "TwoCaptcha") -> "_PendingPoller":
+        """Get the shared poller for this provider's endpoint and key."""
+        key = (provider.BASE_URL, provider.api_key)
+        with cls._pollers_lock:
+            poller = cls._pollers.get(key)
+            if poller is None:
+                poller = cls._pollers[key] = cls(key)
+            return poller
+    
+    def __init__(self, key: Tuple[str, str]):
+        self._key = key
+        self._cond = threading.Condition()
+        # task_id -> [future, next_due, started, kind, owner]
+        self._pending: Dict[str, list] = {}
+        self._thread: Optional[threading.Thread] = None
+        # Shared batch schedule: current interval and earliest next request
+        self._delay: Optional[float] = None
+        self._next_poll = 0.0
+    
+    def submit(self, owner: CaptchaProvider, task_id: str, kind: str = None) -> Future:
+        """Start polling task_id; the future resolves to the solution code."""
+        future = Future()
+        delay = owner._first_delay(kind)
+        now = time.monotonic()
+        
+        with self._cond:
+            self._pending[task_id] = [future, now + delay * random.uniform(0.7, 1.3), now, kind, owner]
+            if self._delay is None:
+                self._delay = owner.poll_initial
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="2captcha-poller", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+    
+    def cancel(self, task_id: str):
+        """Stop polling task_id (e.g. after the caller timed out)."""
+        with self._cond:
+            self._pending.pop(task_id, None)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._pending:
+                        self._thread = None
+                        self._delay = None
+                        # Unregister so the poller (and its last owner) can be freed
+                        with self._pollers_lock:
+                            if self._pollers.get(self._key) is self:
+                                del self._pollers[self._key]
+                        return
+                    now = time.monotonic()
+                    wake = max(self._next_poll, min(entry[1] for entry in self._pending.values()))
+                    if wake <= now:
+                        break
+                    self._cond.wait(wake - now)
+                # Longest-waiting due tasks first; polled ids move to the back
+                due = sorted((entry[1], task_id) for task_id, entry in self._pending.items() if entry[1] <= now)
+                ids = [task_id for _, task_id in due[:self.MAX_IDS]]
+                # The newest task's owner is still waiting, so its session is open
+                owner = self._pending[max(ids, key=lambda task_id: self._pending[task_id][2])][4]
+            
+            try:
+                result = owner._request("res", {"action": "get", "ids": ",".join(ids)})
+                answers = str(result.get("request", "")).split("|")
+            except Exception:
+                answers = None  # Network hiccup: back off and retry
+            
+            if answers is not None and len(answers) != len(ids) and "ERROR" in answers[0]:
+                # Whole-request error (bad key, no such ids, ...)
+                self._finish(ids, error=f"Captcha solve error: {answers[0]}")
+                continue
+            
+            now = time.monotonic()
+            with self._cond:
+                # One interval for the whole batch: every polled id waits it out
+                next_due = now + self._delay * random.uniform(0.7, 1.3)
+                self._next_poll = next_due
+                self._delay = min(owner.poll_max, self._delay * owner.poll_mult)
+                
+                for i, task_id in enumerate(ids):
+                    entry = self._pending.get(task_id)
+                    if entry is None:
+                        continue
+                    answer = answers[i] if answers is not None and len(answers) == len(ids) else "CAPCHA_NOT_READY"
+                    
+                    if answer == "CAPCHA_NOT_READY":
+                        entry[1] = next_due
+                        continue
+                    
+                    del self._pending[task_id]
+                    future, _, started, kind, task_owner = entry
+                    if answer.startswith("ERROR"):
+                        future.set_exception(Exception(f"Captcha solve error: {answer}"))
+                        continue
+                    
+                    task_owner._record_solve(kind, now - started)
+                    future.set_result(answer[3:] if answer.startswith("OK:") else answer)
+    
+    def _finish(self, ids, error: str):
+        with self._cond:
+            for task_id in ids:
+                entry = self._pending.pop(task_id, None)
+                if entry is not None:
+                    entry[0].set_exception(Exception(error))
+
+
+# Secret added to this process's pingback URLs; callbacks without it are rejected
+_PINGBACK_TOKEN = secrets.token_urlsafe(16)
+
+
+def _pingback_url(url: str) -> str:
+    """Add the process pingback token to a public pingback URL."""
+    parts = urlsplit(url)
+    query = f"{parts.query}&" if parts.query else ""
+    return urlunsplit(parts._replace(query=query + urlencode({"token": _PINGBACK_TOKEN})))
+
+
+class _PingbackServer:
+    """Local HTTP endpoint that receives 2Captcha pingback results.
+    
+    2Captcha POSTs ``id=<task>&code=<answer>`` to the registered pingback
+    URL when a task is solved; waiters get the answer without polling.
+    Requests must carry the process token (see ``_pingback_url``). One
+    server per host and port, shared by all TwoCaptcha instances, started
+    by the first waiter and shut down when the last one is done.
+    """
+    
+    _servers: Dict[Tuple[str, int], "_PingbackServer"] = {}
+    _servers_lock = threading.Lock()
+    
+    @classmethod
+    def expect_on(cls, host: str, port: int, task_id: str) -> Optional[Tuple["_PingbackServer", Future]]:
+        """Wait for task_id on the server at host:port, starting it if needed.
+        
+        Returns:
+            (server, future for the answer), or None if the port cannot be bound
+        """
+        with cls._servers_lock:
+            server = cls._servers.get((host, port))
+            if server is None:
+                try:
+                    server = cls(host, port)
+                except OSError:
+                    return None
+                cls._servers[(host, port)] = server
+            return server, server.expect(task_id)
+    
+    def __init__(self, host: str, port: int):
+        self._key = (host, port)
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, Future] = {}
+        # Answers that arrived before anyone waited for them
+        self._early: Dict[str, str] = {}
+        
+        owner = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self._reply(parse_qs(self.rfile.read(length).decode("utf-8", "replace")))
+            
+            def do_GET(self):
+                self._reply({})
+            
+            def _reply(self, fields):
+                query = parse_qs(urlsplit(self.path).query)
+                token = (query.get("token") or [""])[0]
+                if not hmac.compare_digest(token.encode(), _PINGBACK_TOKEN.encode()):
+                    self.send_response(403)
+                    self.end_headers()
+                    return
+                
+                fields = {**query, **fields}
+                task_id = (fields.get("id") or [None])[0]
+                if task_id:
+                    owner._resolve(task_id, (fields.get("code") or [""])[0])
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(b"OK")
+            
+            def log_message(self, *args):
+                pass
+        
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name="2captcha-pingback", daemon=True).start()
+    
+    def expect(self, task_id: str) -> Future:
+        """Future for task_id's answer (already resolved if it came early)."""
+        future = Future()
+        with self._lock:
+            if task_id in self._early:
+                future.set_result(self._early.pop(task_id))
+            else:
+                self._waiters[task_id] = future
+        return future
+    
+    def discard(self, task_id: str):
+        """Stop waiting for task_id; shuts the server down once nobody waits."""
+        with self._servers_lock:
+            with self._lock:
+                self._waiters.pop(task_id, None)
+                if self._waiters:
+                    return
+            if self._servers.get(self._key) is self:
+                del self._servers[self._key]
+            self.shutdown()
+    
+    def shutdown(self):
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    
+    def _resolve(self, task_id: str, code: str):
+        with self._lock:
+            future = self._waiters.pop(task_id, None)
+            if future is None:
+                if len(self._early) < 1024:
+                    self._early[task_id] = code
+                return
+        future.set_result(code)
+
+
 class TwoCaptcha(CaptchaProvider):
-    """2Captcha API integration."""
+    """2Captcha API integration.
+    
+    With ``pingback`` set, 2Captcha calls that public URL when a task is
+    solved instead of being polled; it must be forwarded (e.g. by a reverse
+    proxy) to a local listener on ``pingback_host:pingback_port`` and be
+    registered in the 2Captcha account. A per-process token is added to
+    the URL and callbacks without it are rejected. If the port cannot be
+    bound, results are polled as usual.
+    """
     
     BASE_URL = "https://2captcha.com"
     
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        pingback: str = None,
+        pingback_port: int = 8765,
+        pingback_host: str = "127.0.0.1",
+    ):
         self.api_key = api_key or os.getenv("TWOCAPTCHA_KEY")
         if not self.api_key:
             raise ValueError("2Captcha API key required. Set TWOCAPTCHA_KEY")
+        self._solve_times: Dict[str, float] = {}
+        self._session = self._setup_session()
+        self.pingback = _pingback_url(pingback) if pingback else None
+        self.pingback_host = pingback_host
+        self.pingback_port = pingback_port
     
     def _request(self, method: str, params: Dict = None) -> Dict:
         """Make API request."""
@@ -54,11 +422,13 @@ class TwoCaptcha(CaptchaProvider):
         params["json"] = 1
         
         url = f"{self.BASE_URL}/{method}.php"
-        response = requests.get(url, params=params, timeout=30)
-        return response.json()
+        response = self._session.get(url, params=params, timeout=30)
+        return response_json(response)
     
     def _submit(self, method: str, params: Dict) -> str:
         """Submit captcha and get ID."""
+        if self.pingback:
+            params["pingback"] = self.pingback
         result = self._request(method, params)
         
         if result.get("status") == 1:
@@ -66,27 +436,46 @@ class TwoCaptcha(CaptchaProvider):
         
         raise Exception(f"Captcha submission failed: {result.get('request', 'Unknown error')}")
     
-    def _wait_for_result(self, task_id: str, timeout: int = 120) -> str:
-        """Poll for solution."""
-        start = time.time()
+    def _poll_async(self, task_id: str, kind: str = None) -> Future:
+        """Queue task_id on the shared batch poller; the future yields the code."""
+        return _PendingPoller.for_provider(self).submit(self, task_id, kind)
+    
+    def _wait_for_result(self, task_id: str, timeout: int = 120, kind: str = None) -> str:
+        """Poll for solution.
         
-        while time.time() - start < timeout:
-            result = self._request("res", {"id": task_id})
-            
-            if result.get("status") == 1:
-                return result["request"]
-            
-            if result.get("request") == "CAPCHA_NOT_READY":
-                time.sleep(5)
-                continue
-            
-            # Error
-            if isinstance(result.get("request"), str) and "ERROR" in result["request"]:
-                raise Exception(f"Captcha solve error: {result['request']}")
-            
-            time.sleep(5)
+        Concurrent solves on the same API key share one status request per
+        poll (``res.php?action=get&ids=...``) instead of one each. With a
+        pingback, the answer is awaited from the callback instead.
+        """
+        if self.pingback:
+            waiting = _PingbackServer.expect_on(self.pingback_host, self.pingback_port, task_id)
+            if waiting is not None:
+                return self._wait_for_pingback(task_id, timeout, kind, *waiting)
         
-        raise Exception("Captcha solve timeout")
+        try:
+            return self._poll_async(task_id, kind).result(timeout)
+        except FutureTimeout:
+            _PendingPoller.for_provider(self).cancel(task_id)
+            raise Exception("Captcha solve timeout")
+    
+    def _wait_for_pingback(self, task_id: str, timeout: int, kind: str,
+                           server: _PingbackServer, answer: Future) -> str:
+        """Wait for the pingback; poll once at the end in case it was lost."""
+        start = time.monotonic()
+        try:
+            code = answer.result(timeout)
+        except FutureTimeout:
+            result = self._request("res", {"action": "get", "id": task_id})
+            if result.get("status") != 1:
+                raise Exception("Captcha solve timeout")
+            code = result["request"]
+        finally:
+            server.discard(task_id)
+        
+        if code.startswith("ERROR"):
+            raise Exception(f"Captcha solve error: {code}")
+        self._record_solve(kind, time.monotonic() - start)
+        return code
     
     def solve_image(self, image_path: str = None, image_url: str = None) -> CaptchaSolution:
         """Solve image captcha."""
@@ -94,14 +483,30 @@ class TwoCaptcha(CaptchaProvider):
         
         if image_path:
             with open(image_path, "rb") as f:
-                files = {"file": f}
-                response = requests.post(
-                    f"{self.BASE_URL}/in.php",
-                    data={"key": self.api_key, "json": 1},
-                    files=files,
-                    timeout=30
-                )
-            result = response.json()
+                if TOOLBELT_AVAILABLE:
+                    # Streamed from the file; requests would buffer the whole body
+                    fields = {
+                        "key": self.api_key,
+                        "json": "1",
+                        "file": (os.path.basename(image_path), f, "application/octet-stream"),
+                    }
+                    if self.pingback:
+                        fields["pingback"] = self.pingback
+                    encoder = MultipartEncoder(fields=fields)
+                    response = self._session.post(
+                        f"{self.BASE_URL}/in.php",
+                        data=encoder,
+                        headers={"Content-Type": encoder.content_type},
+                        timeout=30
+                    )
+                else:
+                    response = self._session.post(
+                        f"{self.BASE_URL}/in.php",
+                        data={"key": self.api_key, "json": 1, **({"pingback": self.pingback} if self.pingback else {})},
+                        files={"file": f},
+                        timeout=30
+                    )
+            result = response_json(response)
             
             if result.get("status") != 1:
                 raise Exception(f"Upload failed: {result.get('request')}")
@@ -116,7 +521,7 @@ class TwoCaptcha(CaptchaProvider):
             raise ValueError("Either image_path or image_url required")
         
         # Wait for solution
-        code = self._wait_for_result(task_id)
+        code = self._wait_for_result(task_id, kind="image")
         
         return CaptchaSolution(
             code=code,
@@ -133,7 +538,7 @@ class TwoCaptcha(CaptchaProvider):
         }
         
         task_id = self._submit("in", params)
-        code = self._wait_for_result(task_id)
+        code = self._wait_for_result(task_id, kind="recaptcha")
         
         return CaptchaSolution(
             code=code,
@@ -150,7 +555,7 @@ class TwoCaptcha(CaptchaProvider):
         }
         
         task_id = self._submit("in", params)
-        code = self._wait_for_result(task_id)
+        code = self._wait_for_result(task_id, kind="hcaptcha")
         
         return CaptchaSolution(
             code=code,
@@ -170,7 +575,7 @@ class TwoCaptcha(CaptchaProvider):
         }
         
         task_id = self._submit("in", params)
-        code = self._wait_for_result(task_id)
+        code = self._wait_for_result(task_id, kind="recaptcha_v3")
         
         return CaptchaSolution(
             code=code,
@@ -188,17 +593,19 @@ class AntiCaptcha(CaptchaProvider):
         self.api_key = api_key or os.getenv("ANTICAPTCHA_KEY")
         if not self.api_key:
             raise ValueError("Anti-Captcha API key required. Set ANTICAPTCHA_KEY")
+        self._solve_times: Dict[str, float] = {}
+        self._session = self._setup_session()
     
     def _request(self, method: str, data: Dict) -> Dict:
         """Make API request."""
         data["clientKey"] = self.api_key
         
-        response = requests.post(
+        response = self._session.post(
             f"{self.BASE_URL}/{method}",
             json=data,
             timeout=30
         )
-        return response.json()
+        return response_json(response)
     
     def _submit(self, task_data: Dict) -> str:
         """Submit captcha and get ID."""
@@ -209,52 +616,40 @@ class AntiCaptcha(CaptchaProvider):
         
         raise Exception(f"Submission failed: {result.get('errorDescription', 'Unknown')}")
     
-    def _wait_for_result(self, task_id: str, timeout: int = 120) -> str:
-        """Poll for solution."""
-        start = time.time()
-        
-        while time.time() - start < timeout:
+    def _wait_for_result(self, task_id: str, timeout: int = 120, kind: str = None, field: str = "gRecaptchaResponse") -> str:
+        """Poll for solution (``field`` of the task's solution object)."""
+        def check() -> Optional[str]:
             result = self._request("getTaskResult", {"taskId": task_id})
             
             if result.get("status") == "ready":
-                return result["solution"]["gRecaptchaResponse"]
+                return result["solution"][field]
             
             if result.get("status") == "processing":
-                time.sleep(5)
-                continue
+                return None
             
             raise Exception(f"Solve error: {result}")
         
-        raise Exception("Captcha solve timeout")
+        return self._poll(check, timeout, kind)
     
     def solve_image(self, image_path: str = None, image_url: str = None) -> CaptchaSolution:
         """Solve image captcha."""
         task_data = {"type": "ImageToTextTask"}
         
         if image_path:
-            with open(image_path, "rb") as f:
-                task_data["body"] = base64.b64encode(f.read()).decode()
+            task_data["body"] = _b64_file(image_path)
         elif image_url:
             task_data["body"] = image_url.replace("data:", "").split(",", 1)[1] if "," in image_url else image_url
         else:
             raise ValueError("Either image_path or image_url required")
         
         task_id = self._submit(task_data)
+        code = self._wait_for_result(task_id, kind="image", field="text")
         
-        start = time.time()
-        while time.time() - start < 120:
-            result = self._request("getTaskResult", {"taskId": task_id})
-            
-            if result.get("status") == "ready":
-                return CaptchaSolution(
-                    code=result["solution"]["text"],
-                    provider="anticaptcha",
-                    task_id=task_id
-                )
-            
-            time.sleep(5)
-        
-        raise Exception("Captcha solve timeout")
+        return CaptchaSolution(
+            code=code,
+            provider="anticaptcha",
+            task_id=task_id
+        )
     
     def solve_recaptcha(self, sitekey: str, url: str) -> CaptchaSolution:
         """Solve reCAPTCHA v2."""
@@ -265,7 +660,7 @@ class AntiCaptcha(CaptchaProvider):
         }
         
         task_id = self._submit(task_data)
-        code = self._wait_for_result(task_id)
+        code = self._wait_for_result(task_id, kind="recaptcha")
         
         return CaptchaSolution(
             code=code,
@@ -282,7 +677,7 @@ class AntiCaptcha(CaptchaProvider):
         }
         
         task_id = self._submit(task_data)
-        code = self._wait_for_result(task_id)
+        code = self._wait_for_result(task_id, kind="hcaptcha")
         
         return CaptchaSolution(
             code=code,
@@ -301,7 +696,7 @@ class AntiCaptcha(CaptchaProvider):
         }
         
         task_id = self._submit(task_data)
-        code = self._wait_for_result(task_id)
+        code = self._wait_for_result(task_id, kind="recaptcha_v3")
         
         return CaptchaSolution(
             code=code,
@@ -310,6 +705,254 @@ class AntiCaptcha(CaptchaProvider):
         )
 
 
+# ============ Async Providers ============
+
+class AsyncCaptchaProvider(CaptchaProvider):
+    """Base class for asyncio captcha providers.
+    
+    Polling waits with asyncio.sleep on a shared httpx.AsyncClient, so many
+    solves can be in flight on one event loop without a thread each.
+    """
+    
+    def _setup_session(self) -> "httpx.AsyncClient":
+        """Create the keep-alive async client used for all API calls."""
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is not available. Install: pip install 'httpx[http2]'")
+        return httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        )
+    
+    async def _apoll(self, check: Callable, timeout: float = 120, kind: str = None) -> str:
+        """Async version of _poll(); check is a coroutine function."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + timeout
+        delay = self._first_delay(kind)
+        
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise Exception("Captcha solve timeout")
+            await asyncio.sleep(min(delay * random.uniform(0.7, 1.3), remaining))
+            
+            result = await check()
+            if result is not None:
+                self._record_solve(kind, loop.time() - start)
+                return result
+            
+            delay = min(self.poll_max, delay * self.poll_mult)
+    
+    # ============ Context Manager ============
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the HTTP client."""
+        await self._session.aclose()
+    
+    def __enter__(self):
+        raise TypeError(f"{type(self).__name__} is asynchronous; use 'async with'")
+    
+    def close(self):
+        raise TypeError(f"{type(self).__name__} is asynchronous; use 'await aclose()'")
+
+
+class AsyncTwoCaptcha(AsyncCaptchaProvider):
+    """2Captcha API integration for asyncio."""
+    
+    BASE_URL = TwoCaptcha.BASE_URL
+    
+    def __init__(self, api_key: str = None):
+        self.api_key = api_key or os.getenv("TWOCAPTCHA_KEY")
+        if not self.api_key:
+            raise ValueError("2Captcha API key required. Set TWOCAPTCHA_KEY")
+        self._solve_times: Dict[str, float] = {}
+        self._session = self._setup_session()
+    
+    async def _request(self, method: str, params: Dict = None) -> Dict:
+        """Make API request."""
+        params = params or {}
+        params["key"] = self.api_key
+        params["json"] = 1
+        
+        response = await self._session.get(f"{self.BASE_URL}/{method}.php", params=params)
+        return response_json(response)
+    
+    async def _submit(self, method: str, params: Dict) -> str:
+        """Submit captcha and get ID."""
+        result = await self._request(method, params)
+        
+        if result.get("status") == 1:
+            return result["request"]
+        
+        raise Exception(f"Captcha submission failed: {result.get('request', 'Unknown error')}")
+    
+    async def _wait_for_result(self, task_id: str, timeout: int = 120, kind: str = None) -> str:
+        """Poll for solution."""
+        async def check() -> Optional[str]:
+            result = await self._request("res", {"action": "get", "id": task_id})
+            
+            if result.get("status") == 1:
+                return result["request"]
+            
+            if isinstance(result.get("request"), str) and "ERROR" in result["request"]:
+                raise Exception(f"Captcha solve error: {result['request']}")
+            
+            return None  # CAPCHA_NOT_READY
+        
+        return await self._apoll(check, timeout, kind)
+    
+    async def _solve(self, params: Dict, kind: str) -> CaptchaSolution:
+        task_id = await self._submit("in", params)
+        code = await self._wait_for_result(task_id, kind=kind)
+        return CaptchaSolution(code=code, provider="2captcha", task_id=task_id)
+    
+    async def solve_image(self, image_path: str = None, image_url: str = None) -> CaptchaSolution:
+        """Solve image captcha."""
+        if image_path:
+            with open(image_path, "rb") as f:
+                response = await self._session.post(
+                    f"{self.BASE_URL}/in.php",
+                    data={"key": self.api_key, "json": 1},
+                    files={"file": f},
+                )
+            result = response_json(response)
+            
+            if result.get("status") != 1:
+                raise Exception(f"Upload failed: {result.get('request')}")
+            
+            task_id = result["request"]
+        
+        elif image_url:
+            task_id = await self._submit("load", {"body": image_url})
+        
+        else:
+            raise ValueError("Either image_path or image_url required")
+        
+        code = await self._wait_for_result(task_id, kind="image")
+        return CaptchaSolution(code=code, provider="2captcha", task_id=task_id)
+    
+    async def solve_recaptcha(self, sitekey: str, url: str) -> CaptchaSolution:
+        """Solve reCAPTCHA v2."""
+        return await self._solve({
+            "googlekey": sitekey,
+            "pageurl": url,
+            "method": "userrecaptcha"
+        }, "recaptcha")
+    
+    async def solve_hcaptcha(self, sitekey: str, url: str) -> CaptchaSolution:
+        """Solve hCaptcha."""
+        return await self._solve({
+            "sitekey": sitekey,
+            "pageurl": url,
+            "method": "hcaptcha"
+        }, "hcaptcha")
+    
+    async def solve_recaptcha_v3(self, sitekey: str, url: str, action: str = "verify", min_score: float = 0.3) -> CaptchaSolution:
+        """Solve reCAPTCHA v3."""
+        return await self._solve({
+            "googlekey": sitekey,
+            "pageurl": url,
+            "version": "v3",
+            "action": action,
+            "min_score": min_score,
+            "method": "userrecaptcha"
+        }, "recaptcha_v3")
+
+
+class AsyncAntiCaptcha(AsyncCaptchaProvider):
+    """Anti-Captcha API integration for asyncio."""
+    
+    BASE_URL = AntiCaptcha.BASE_URL
+    
+    def __init__(self, api_key: str = None):
+        self.api_key = api_key or os.getenv("ANTICAPTCHA_KEY")
+        if not self.api_key:
+            raise ValueError("Anti-Captcha API key required. Set ANTICAPTCHA_KEY")
+        self._solve_times: Dict[str, float] = {}
+        self._session = self._setup_session()
+    
+    async def _request(self, method: str, data: Dict) -> Dict:
+        """Make API request."""
+        data["clientKey"] = self.api_key
+        
+        response = await self._session.post(f"{self.BASE_URL}/{method}", json=data)
+        return response_json(response)
+    
+    async def _submit(self, task_data: Dict) -> str:
+        """Submit captcha and get ID."""
+        result = await self._request("createTask", {"task": task_data})
+        
+        if result.get("errorId") == 0:
+            return result["taskId"]
+        
+        raise Exception(f"Submission failed: {result.get('errorDescription', 'Unknown')}")
+    
+    async def _wait_for_result(self, task_id: str, timeout: int = 120, kind: str = None, field: str = "gRecaptchaResponse") -> str:
+        """Poll for solution (``field`` of the task's solution object)."""
+        async def check() -> Optional[str]:
+            result = await self._request("getTaskResult", {"taskId": task_id})
+            
+            if result.get("status") == "ready":
+                return result["solution"][field]
+            
+            if result.get("status") == "processing":
+                return None
+            
+            raise Exception(f"Solve error: {result}")
+        
+        return await self._apoll(check, timeout, kind)
+    
+    async def _solve(self, task_data: Dict, kind: str, field: str = "gRecaptchaResponse") -> CaptchaSolution:
+        task_id = await self._submit(task_data)
+        code = await self._wait_for_result(task_id, kind=kind, field=field)
+        return CaptchaSolution(code=code, provider="anticaptcha", task_id=task_id)
+    
+    async def solve_image(self, image_path: str = None, image_url: str = None) -> CaptchaSolution:
+        """Solve image captcha."""
+        task_data = {"type": "ImageToTextTask"}
+        
+        if image_path:
+            task_data["body"] = _b64_file(image_path)
+        elif image_url:
+            task_data["body"] = image_url.replace("data:", "").split(",", 1)[1] if "," in image_url else image_url
+        else:
+            raise ValueError("Either image_path or image_url required")
+        
+        return await self._solve(task_data, "image", field="text")
+    
+    async def solve_recaptcha(self, sitekey: str, url: str) -> CaptchaSolution:
+        """Solve reCAPTCHA v2."""
+        return await self._solve({
+            "type": "RecaptchaV2TaskProxyless",
+            "websiteURL": url,
+            "websiteKey": sitekey
+        }, "recaptcha")
+    
+    async def solve_hcaptcha(self, sitekey: str, url: str) -> CaptchaSolution:
+        """Solve hCaptcha."""
+        return await self._solve({
+            "type": "HCaptchaTaskProxyless",
+            "websiteURL": url,
+            "websiteKey": sitekey
+        }, "hcaptcha")
+    
+    async def solve_recaptcha_v3(self, sitekey: str, url: str, action: str = "verify", min_score: float = 0.3) -> CaptchaSolution:
+        """Solve reCAPTCHA v3."""
+        return await self._solve({
+            "type": "RecaptchaV3TaskProxyless",
+            "websiteURL": url,
+            "websiteKey": sitekey,
+            "minScore": min_score,
+            "action": action
+        }, "recaptcha_v3")
+
+
 class CaptchaSolver:
     """Unified captcha solver with multiple provider support."""
     
@@ -318,20 +961,31 @@ class CaptchaSolver:
         "anticaptcha": AntiCaptcha,
     }
     
-    def __init__(self, provider: str = "2captcha", api_key: str = None):
+    def __init__(self, provider: str = "2captcha", api_key: str = None, **options):
         """Initialize solver.
         
         Args:
             provider: "2captcha" or "anticaptcha"
             api_key: Provider API key (or use env var)
+            **options: Provider-specific options (e.g. 2captcha ``pingback``)
         """
         provider_class = self.PROVIDERS.get(provider)
         if not provider_class:
             raise ValueError(f"Unknown provider: {provider}. Available: {list(self.PROVIDERS.keys())}")
         
-        self.provider = provider_class(api_key)
+        self.provider = provider_class(api_key, **options)
         self.provider_name = provider
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def close(self):
+        """Close the provider's HTTP session."""
+        self.provider.close()
+    
     def solve_image(self, image_path: str = None, image_url: str = None) -> str:
         """Solve image captcha.
         
@@ -394,6 +1048,77 @@ class CaptchaSolver:
             raise ValueError(f"Unknown captcha type: {captcha_type}")
 
 
+class AsyncCaptchaSolver:
+    """Unified asyncio captcha solver.
+    
+    Usage:
+        async with AsyncCaptchaSolver("2captcha") as solver:
+            tokens = await asyncio.gather(
+                *(solver.asolve_recaptcha(key, url) for key, url in targets)
+            )
+    """
+    
+    PROVIDERS = {
+        "2captcha": AsyncTwoCaptcha,
+        "anticaptcha": AsyncAntiCaptcha,
+    }
+    
+    def __init__(self, provider: str = "2captcha", api_key: str = None, **options):
+        """Initialize solver.
+        
+        Args:
+            provider: "2captcha" or "anticaptcha"
+            api_key: Provider API key (or use env var)
+            **options: Provider-specific options, as for CaptchaSolver
+        """
+        provider_class = self.PROVIDERS.get(provider)
+        if not provider_class:
+            raise ValueError(f"Unknown provider: {provider}. Available: {list(self.PROVIDERS.keys())}")
+        
+        self.provider = provider_class(api_key, **options)
+        self.provider_name = provider
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the provider's HTTP client."""
+        await self.provider.aclose()
+    
+    async def asolve_image(self, image_path: str = None, image_url: str = None) -> str:
+        """Solve image captcha; see CaptchaSolver.solve_image."""
+        solution = await self.provider.solve_image(image_path, image_url)
+        return solution.code
+    
+    async def asolve_recaptcha(self, sitekey: str, url: str, version: str = "v2") -> str:
+        """Solve reCAPTCHA; see CaptchaSolver.solve_recaptcha."""
+        if version == "v3":
+            solution = await self.provider.solve_recaptcha_v3(sitekey, url)
+        else:
+            solution = await self.provider.solve_recaptcha(sitekey, url)
+        
+        return solution.code
+    
+    async def asolve_hcaptcha(self, sitekey: str, url: str) -> str:
+        """Solve hCaptcha; see CaptchaSolver.solve_hcaptcha."""
+        solution = await self.provider.solve_hcaptcha(sitekey, url)
+        return solution.code
+    
+    async def asolve(self, captcha_type: str, **kwargs) -> str:
+        """Generic solve method; see CaptchaSolver.solve."""
+        if captcha_type == "image":
+            return await self.asolve_image(**kwargs)
+        elif captcha_type == "recaptcha":
+            return await self.asolve_recaptcha(**kwargs)
+        elif captcha_type == "hcaptcha":
+            return await self.asolve_hcaptcha(**kwargs)
+        else:
+            raise ValueError(f"Unknown captcha type: {captcha_type}")
+
+
 # Convenience function
 def solve_captcha(captcha_type: str, provider: str = "2captcha", **kwargs) -> str:
     """Quick captcha solving.
@@ -406,5 +1131,5 @@ def solve_captcha(captcha_type: str, provider: str = "2captcha", **kwargs) -> st
     Returns:
         Solution string
     """
-    solver = CaptchaSolver(provider=provider)
-    return solver.solve(captcha_type, **kwargs)
+    with CaptchaSolver(provider=provider) as solver:
+        return solver.solve(captcha_type, **kwargs)
@@ -1,11 +1,26 @@
 """HTTP client with stealth capabilities for request-based scraping."""
 import os
+import ssl
 import time
 import random
+import socket
+import sys
+import functools
+import hashlib
+import importlib.util
+import itertools
+import threading
 import requests
-from typing import Optional, Dict, Any, List, Callable
+import urllib3.util.connection
+import urllib3.util.request
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, List, Callable, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, urlsplit
 
 # Optional: fake-useragent
 try:
@@ -14,7 +29,107 @@ try:
 except ImportError:
     FAKE_UA_AVAILABLE = False
 
-from .utils import Cache, RateLimiter, retry
+# Optional: httpx for async clients (HTTP/2 needs the h2 extra)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+from .utils import Cache, RateLimiter, KeyedRateLimiter, retry, response_json
+
+
+# ============ TLS / DNS ============
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context(http2: bool = True) -> ssl.SSLContext:
+    """Shared verifying SSL context for httpx clients.
+    
+    Loading the CA bundle costs tens of milliseconds, so it is done once per
+    process instead of per client. Keyed on http2 because httpcore sets ALPN
+    on the context it is given.
+    """
+    import certifi
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+_dns_cache: Optional[Cache] = None
+_create_connection = urllib3.util.connection.create_connection
+
+
+def _create_connection_cached(address, *args, **kwargs):
+    """urllib3 create_connection that resolves through the DNS cache."""
+    cache = _dns_cache
+    if cache is None:  # Disabled while this connection was being set up
+        return _create_connection(address, *args, **kwargs)
+    
+    host, port = address
+    host = host.strip("[]")
+    family = urllib3.util.connection.allowed_gai_family()
+    addresses = cache.get_or_compute(
+        (host, port, family, socket.SOCK_STREAM),
+        lambda: socket.getaddrinfo(host, port, family, socket.SOCK_STREAM),
+    )
+    err = None
+    for *_, sockaddr in addresses:
+        try:
+            return _create_connection(sockaddr[:2], *args, **kwargs)
+        except OSError as e:
+            err = e
+    raise err or OSError(f"getaddrinfo returned no addresses for {host}")
+
+
+def enable_dns_cache(ttl: float = 300, max_size: int = 256):
+    """Cache DNS lookups for all requests-based connections in this process.
+    
+    Patches urllib3's connection factory, so repeated connections to the same
+    host (or proxy) skip the resolver. TLS still uses the original hostname.
+    Calling it again with other settings replaces the cache (dropping its
+    entries); disable_dns_cache() undoes the patch.
+    
+    Args:
+        ttl: Seconds to keep a resolved address
+        max_size: Max cached (host, port) entries
+    """
+    global _dns_cache
+    if _dns_cache is None or (_dns_cache.ttl, _dns_cache.max_size) != (ttl, max_size):
+        _dns_cache = Cache(ttl=ttl, max_size=max_size)
+    urllib3.util.connection.create_connection = _create_connection_cached
+
+
+def disable_dns_cache():
+    """Undo enable_dns_cache(): restore urllib3's connection factory."""
+    global _dns_cache
+    urllib3.util.connection.create_connection = _create_connection
+    _dns_cache = None
+
+
+def _cached_response(entry: tuple) -> requests.Response:
+    """Rebuild a Response from a (status, content, headers, url, encoding) cache entry."""
+    response = requests.Response()
+    response.status_code, response._content, headers, response.url, response.encoding = entry
+    response.headers = CaseInsensitiveDict(headers)
+    return response
+
+
+class _NoStoreCookiePolicy(DefaultCookiePolicy):
+    """Send configured cookies but never store ones set by responses."""
+    
+    def set_ok(self, cookie, request):
+        return False
+
+
+# User agents, interned once and shared (not copied) by every client
+_UA_POOL = tuple(sys.intern(ua) for ua in (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0",
+))
 
 
 @dataclass
@@ -33,80 +148,128 @@ class ProxyConfig:
             return f"{self.protocol}://{self.username}:{self.password}@{self.host}:{self.port}"
         return f"{self.protocol}://{self.host}:{self.port}"
     
+    @property
+    def _proxies_dict(self) -> Dict[str, str]:
+        """requests-style {"http": url, "https": url}, rebuilt when the URL changes."""
+        url = self.url
+        cached = self.__dict__.get("_proxies_cache")
+        if cached is None or cached[0] != url:
+            cached = self.__dict__["_proxies_cache"] = (url, {"http": url, "https": url})
+        return cached[1]
+    
     @classmethod
     def from_string(cls, proxy_str: str) -> "ProxyConfig":
         """Parse proxy string like user:pass@host:port or just host:port."""
-        # Remove protocol if present
-        if "://" in proxy_str:
-            protocol, rest = proxy_str.split("://", 1)
-        else:
-            protocol = "http"
-            rest = proxy_str
-        
-        # Check for auth
-        if "@" in rest:
-            auth, host_port = rest.split("@", 1)
-            username, password = auth.split(":", 1)
-        else:
-            username = password = None
-            host_port = rest
-        
-        # Parse host:port
-        if ":" in host_port:
-            host, port = host_port.rsplit(":", 1)
-            port = int(port)
-        else:
-            host = host_port
-            port = 8080
-        
-        return cls(
-            host=host,
-            port=port,
-            protocol=protocol,
-            username=username,
-            password=password
-        )
+        return cls(*_parse_proxy(proxy_str))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_proxy(proxy_str: str) -> tuple:
+    """Split a proxy string into (host, port, protocol, username, password)."""
+    # Remove protocol if present
+    if "://" in proxy_str:
+        protocol, rest = proxy_str.split("://", 1)
+    else:
+        protocol = "http"
+        rest = proxy_str
+    
+    # Check for auth
+    if "@" in rest:
+        auth, host_port = rest.split("@", 1)
+        username, password = auth.split(":", 1)
+    else:
+        username = password = None
+        host_port = rest
+    
+    # Parse host:port
+    if ":" in host_port:
+        host, port = host_port.rsplit(":", 1)
+        port = int(port)
+    else:
+        host = host_port
+        port = 8080
+    
+    return host, port, protocol, username, password
 
 
 class ProxyPool:
     """Pool of rotating proxies."""
     
-    def __init__(self, proxies: List[str] = None, rotate_on_error: bool = True):
+    def __init__(
+        self,
+        proxies: List[str] = None,
+        rotate_on_error: bool = True,
+        rate_limit_calls: int = None,
+        rate_limit_period: float = None,
+        failure_ttl: float = 300,
+    ):
         """Initialize proxy pool.
         
         Args:
             proxies: List of proxy strings
             rotate_on_error: Rotate to next proxy on error
+            rate_limit_calls: Max requests per proxy within rate_limit_period
+            rate_limit_period: Per-proxy rate limit window in seconds
+            failure_ttl: Seconds a failed proxy is skipped before it is tried again
         """
         self.proxies = [ProxyConfig.from_string(p) for p in (proxies or [])]
         self.rotate_on_error = rotate_on_error
+        self.failure_ttl = failure_ttl
         self._index = 0
-        self._failed: set = set()
+        # Failure time by position (0.0 = healthy), and id(proxy) -> position
+        self._failed: List[float] = [0.0] * len(self.proxies)
+        self._positions = {id(p): i for i, p in enumerate(self.proxies)}
+        self._lock = threading.Lock()
+        self._limiter = None
+        
+        if rate_limit_calls and rate_limit_period:
+            self._limiter = KeyedRateLimiter(rate_limit_calls, rate_limit_period)
     
     def add(self, proxy: str):
         """Add proxy to pool."""
-        self.proxies.append(ProxyConfig.from_string(proxy))
+        config = ProxyConfig.from_string(proxy)
+        with self._lock:
+            self._positions[id(config)] = len(self.proxies)
+            self.proxies.append(config)
+            self._failed.append(0.0)
     
     def get(self) -> Optional[ProxyConfig]:
         """Get next working proxy."""
         if not self.proxies:
             return None
         
-        # Try all proxies
-        for _ in range(len(self.proxies)):
-            proxy = self.proxies[self._index]
-            self._index = (self._index + 1) % len(self.proxies)
-            
-            if proxy not in self._failed:
+        throttled = None
+        with self._lock:
+            # Try all proxies, skipping recently failed ones and ones out of rate budget
+            n = len(self.proxies)
+            failed_before = time.monotonic() - self.failure_ttl
+            for _ in range(n):
+                i = self._index
+                self._index = (i + 1) % n
+                
+                failed_at = self._failed[i]
+                if failed_at and failed_at > failed_before:
+                    continue
+                proxy = self.proxies[i]
+                if self._limiter and not self._limiter.acquire(proxy.url):
+                    throttled = throttled or proxy
+                    continue
                 return proxy
+            
+            if not throttled:
+                # All failed, reset and return first
+                self._failed[:] = [0.0] * n
+                return self.proxies[0]
         
-        # All failed, reset and return first
-        self._failed.clear()
-        return self.proxies[0] if self.proxies else None
+        # All working proxies are throttled, wait for the first one
+        self._limiter.wait(throttled.url)
+        return throttled
     
     def mark_failed(self, proxy: ProxyConfig):
         """Mark proxy as failed."""
-        self._failed.add(proxy)
+        i = self._positions.get(id(proxy))
+        if i is not None:
+            self._failed[i] = time.monotonic()
     
     def __len__(self) -> int:
         return len(self.proxies)
@@ -120,10 +283,16 @@ class RequestConfig:
     follow_redirects: bool = True
     verify_ssl: bool = True
     
+    # Connection pooling (keep-alive)
+    pool_connections: int = 32  # Number of hosts to keep pools for
+    pool_maxsize: int = 64  # Max connections kept alive per host
+    max_retries: int = 0  # Connection-level retries with backoff (stack with proxy failover)
+    dns_cache: bool = False  # Process-wide DNS cache (see enable_dns_cache)
+    
     # Identity
     user_agent: str = None  # Auto-generated if None
     accept_language: str = "en-US,en;q=0.9"
-    accept_encoding: str = "gzip, deflate, br"
+    accept_encoding: str = None  # Encodings urllib3 can decode if None (br with brotli installed)
     accept: str = "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8"
     
     # Stealth
@@ -141,6 +310,8 @@ class RequestConfig:
     # Rate limiting
     rate_limit_calls: int = None
     rate_limit_period: float = None
+    host_rate_limit_calls: int = None  # Per-host bucket, keyed by netloc
+    host_rate_limit_period: float = None
     
     # Cookies
     cookies: Dict[str, str] = field(default_factory=dict)
@@ -168,14 +339,7 @@ class StealthClient:
     - Request/response callbacks
     """
     
-    DEFAULT_USER_AGENTS = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0",
-    ]
+    DEFAULT_USER_AGENTS = _UA_POOL
     
     def __init__(self, config: RequestConfig = None):
         self.config = config or RequestConfig()
@@ -189,6 +353,24 @@ class StealthClient:
                 self.config.rate_limit_period
             )
         
+        self._host_limiter = None
+        if self.config.host_rate_limit_calls and self.config.host_rate_limit_period:
+            self._host_limiter = KeyedRateLimiter(
+                self.config.host_rate_limit_calls,
+                self.config.host_rate_limit_period
+            )
+        
+        if self.config.dns_cache and _dns_cache is None:
+            enable_dns_cache()  # Keep settings from an explicit enable_dns_cache()
+        
+        # Parsed config.proxy, parsed up front and rebuilt only if the string changes
+        self._proxy_str = self.config.proxy
+        self._proxy_cfg = ProxyConfig.from_string(self.config.proxy) if self.config.proxy else None
+        
+        # Per-client UA selection: private RNG (random mode), cursor (rotation)
+        self._rng = random.Random()
+        self._ua_cycle = itertools.cycle(self.DEFAULT_USER_AGENTS)
+        
         # Try to use fake-useragent
         self._ua = None
         if self.config.use_fake_user_agent and FAKE_UA_AVAILABLE:
@@ -201,19 +383,38 @@ class StealthClient:
         self._setup_session()
     
     def _setup_session(self):
-        """Setup session with headers and cookies."""
+        """Setup session with pooled adapters, headers and cookies."""
+        # Per-request defaults, built once
+        self._base_request_kwargs = {
+            "timeout": self.config.timeout,
+            "allow_redirects": self.config.follow_redirects,
+            "verify": self.config.verify_ssl,
+        }
+        
+        # Keep-alive connection pool shared by all requests on this client
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            # 0 keeps requests' own default (no retries, read errors raised as-is)
+            max_retries=Retry(total=self.config.max_retries, backoff_factor=0.3) if self.config.max_retries else 0,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
         # Headers
         self.session.headers.update({
             "User-Agent": self._get_user_agent(),
-            "Accept": self.config.accept,
-            "Accept-Language": self.config.accept_language,
-            "Accept-Encoding": self.config.accept_encoding,
+            "Accept": sys.intern(self.config.accept),
+            "Accept-Language": sys.intern(self.config.accept_language),
+            "Accept-Encoding": sys.intern(self.config.accept_encoding or urllib3.util.request.ACCEPT_ENCODING),
         })
         self.session.headers.update(self.config.extra_headers)
         
         # Cookies
         if self.config.cookies:
             self.session.cookies.update(self.config.cookies)
+        if not self.config.persist_cookies:
+            self.session.cookies.set_policy(_NoStoreCookiePolicy())
     
     def _get_user_agent(self) -> str:
         """Get user agent."""
@@ -227,45 +428,33 @@ class StealthClient:
                 pass
         
         if self.config.random_user_agent:
-            return random.choice(self.DEFAULT_USER_AGENTS)
+            return self._rng.choice(self.DEFAULT_USER_AGENTS)
+        
+        if self.config.rotate_user_agent:
+            return next(self._ua_cycle)
         
         return self.DEFAULT_USER_AGENTS[0]
     
-    def _get_proxy(self) -> Optional[Dict]:
-        """Get proxy dict for requests."""
+    def _get_proxy(self) -> Tuple[Optional[ProxyConfig], Optional[Dict]]:
+        """Get the proxy to use and its proxies dict for requests.
+        
+        Returns:
+            (ProxyConfig, {"http": url, "https": url}) or (None, None)
+        """
         # Check proxy pool first
         if self.config.proxy_pool:
             proxy = self.config.proxy_pool.get()
             if proxy:
-                return {"http": proxy.url, "https": proxy.url}
+                return proxy, proxy._proxies_dict
         
         # Single proxy
         if self.config.proxy:
-            proxy_cfg = ProxyConfig.from_string(self.config.proxy)
-            return {"http": proxy_cfg.url, "https": proxy_cfg.url}
+            if self.config.proxy != self._proxy_str:
+                self._proxy_cfg = ProxyConfig.from_string(self.config.proxy)
+                self._proxy_str = self.config.proxy
+            return self._proxy_cfg, self._proxy_cfg._proxies_dict
         
-        return None
-    
-    def _build_request(self, method: str, url: str, **kwargs) -> requests.Request:
-        """Build request object."""
-        # Rotate UA if enabled
-        if self.config.rotate_user_agent:
-            self.session.headers["User-Agent"] = self._get_user_agent()
-        
-        # Merge kwargs
-        request_kwargs = {
-            "timeout": self.config.timeout,
-            "allow_redirects": self.config.follow_redirects,
-            "verify": self.config.verify_ssl,
-        }
-        request_kwargs.update(kwargs)
-        
-        # Proxy
-        proxy = self._get_proxy()
-        if proxy:
-            request_kwargs["proxies"] = proxy
-        
-        return requests.Request(method, url, **request_kwargs)
+        return None, None
     
     def request(self, method: str, url: str, **kwargs) -> requests.Response:
         """Make HTTP request.
@@ -280,63 +469,58 @@ class StealthClient:
         """
         # Rate limiting
         if self._rate_limiter:
-            # Simple blocking wait
-            time.sleep(random.uniform(0.1, 0.3))
+            self._rate_limiter.wait()
+        
+        if self._host_limiter:
+            self._host_limiter.wait(urlsplit(url).netloc)
         
-        # Check cache for GET
+        # Check cache for GET (streamed bodies are never cached)
         cache_key = None
-        if self._cache and method == "GET":
-            cache_key = f"{method}:{url}"
+        if self._cache is not None and method == "GET" and not kwargs.get("stream"):
+            # Fixed-size digest instead of the full (possibly very long) URL
+            cache_key = hashlib.blake2b(url.encode(), digest_size=16).digest()
             cached = self._cache.get(cache_key)
             if cached is not None:
-                return cached
+                return _cached_response(cached)
         
-        # Build request
-        request_kwargs = {}
+        # Config defaults; call kwargs (headers, params, data, json, ...) pass through
+        request_kwargs = dict(self._base_request_kwargs, **kwargs)
         
-        # Headers
-        request_kwargs["headers"] = kwargs.pop("headers", {})
-        
-        # Data/JSON
-        if "data" in kwargs:
-            request_kwargs["data"] = kwargs.pop("data")
-        if "json" in kwargs:
-            request_kwargs["json"] = kwargs.pop("json")
+        # Rotate UA per request, leaving shared session headers untouched so
+        # concurrent requests on one client don't race on them
+        if self.config.rotate_user_agent:
+            headers = request_kwargs.get("headers") or {}
+            if not any(k.lower() == "user-agent" for k in headers):
+                request_kwargs["headers"] = {**headers, "User-Agent": self._get_user_agent()}
+        proxy = None
+        if "proxies" not in request_kwargs:
+            proxy, request_kwargs["proxies"] = self._get_proxy()
         
         # Callback
         if self.config.on_request:
             self.config.on_request(method, url, request_kwargs)
         
         # Make request with retry
-        proxy = self._get_proxy()
-        
         try:
-            response = self.session.request(
-                method,
-                url,
-                **request_kwargs,
-                timeout=self.config.timeout,
-                proxies=proxy,
-                verify=self.config.verify_ssl,
-            )
+            response = self.session.request(method, url, **request_kwargs)
             
             # Callback
             if self.config.on_response:
                 self.config.on_response(response)
             
             # Cache GET responses
-            if self._cache and cache_key and response.status_code == 200:
-                self._cache.set(cache_key, response)
-            
-            # Mark proxy as working if from pool
-            if proxy and self.config.proxy_pool:
-                pass  # Could track success
+            if cache_key and response.status_code == 200:
+                # Plain data, so cached entries don't pin the response/connection
+                self._cache.set(cache_key, (
+                    response.status_code, response.content, dict(response.headers),
+                    response.url, response.encoding,
+                ))
             
             return response
             
         except requests.RequestException as e:
             # Mark proxy as failed
-            if proxy and self.config.proxy_pool and hasattr(proxy, 'host'):
+            if proxy is not None and self.config.proxy_pool:
                 self.config.proxy_pool.mark_failed(proxy)
             
             if self.config.on_error:
@@ -374,23 +558,99 @@ class StealthClient:
     def fetch_json(self, url: str, **kwargs) -> Any:
         """Fetch URL and parse JSON."""
         response = self.get(url, **kwargs)
-        return response.json()
+        return response_json(response)
     
     def fetch_html(self, url: str, **kwargs) -> str:
         """Fetch HTML (alias for fetch)."""
         return self.fetch(url, **kwargs)
     
-    def download(self, url: str, path: str, **kwargs):
-        """Download file to path."""
+    def download(self, url: str, path: str, sha256: str = None, chunk_size: int = 1 << 20, **kwargs):
+        """Download file to path.
+        
+        The body is streamed to disk in ``chunk_size`` pieces, so memory
+        stays flat for large files.
+        
+        Args:
+            url: File URL
+            path: Destination path
+            sha256: Expected hex digest; checked in the same pass as the write
+            chunk_size: Bytes read per iteration
+        
+        Returns:
+            path
+        """
         response = self.get(url, stream=True, **kwargs)
-        response.raise_for_status()
         
-        with open(path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        digest = hashlib.sha256() if sha256 else None
+        with response:
+            # Inside the with: an error response still releases its connection
+            response.raise_for_status()
+            with open(path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    if digest:
+                        digest.update(chunk)
+        
+        if digest and digest.hexdigest() != sha256.lower():
+            os.remove(path)
+            raise ValueError(f"SHA-256 mismatch for {url}: got {digest.hexdigest()}")
         
         return path
     
+    def download_many(self, items: List[Tuple[str, str]], max_workers: int = 8, **kwargs) -> List[Union[str, Exception]]:
+        """Download many files concurrently over the pooled session.
+        
+        Args:
+            items: (url, path) pairs
+            max_workers: Downloads in flight at once
+            **kwargs: Passed to download()
+        
+        Returns:
+            Per item, in order: the path, or the exception that download raised
+        """
+        def fetch(item):
+            try:
+                return self.download(item[0], item[1], **kwargs)
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+            return list(pool.map(fetch, items))
+    
+    def async_client(self, http2: bool = True) -> "httpx.AsyncClient":
+        """Create an httpx.AsyncClient with this client's identity and proxy.
+        
+        With HTTP/2, concurrent requests to one host are multiplexed over a
+        single keep-alive TCP+TLS connection.
+        
+        Args:
+            http2: Enable HTTP/2 (requires the h2 package)
+        """
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is not available. Install: pip install 'httpx[http2]'")
+        
+        # Let httpx advertise only the encodings it can decode
+        headers = {k: v for k, v in self.session.headers.items() if k.lower() != "accept-encoding"}
+        
+        kwargs = {
+            "headers": headers,
+            "cookies": self.cookies,
+            "timeout": self.config.timeout,
+            "verify": _ssl_context(http2 and HTTP2_AVAILABLE) if self.config.verify_ssl is True else self.config.verify_ssl,
+            "follow_redirects": self.config.follow_redirects,
+            "http2": http2 and HTTP2_AVAILABLE,
+            "limits": httpx.Limits(
+                max_connections=self.config.pool_maxsize,
+                max_keepalive_connections=self.config.pool_maxsize,
+            ),
+        }
+        
+        _, proxy = self._get_proxy()
+        if proxy:
+            kwargs["proxy"] = proxy["https"]
+        
+        return httpx.AsyncClient(**kwargs)
+    
     # ============ Session Management ============
     
     def save_session(self, path: str):
@@ -444,16 +704,37 @@ class StealthClient:
 
 # ============ Quick Client ============
 
+# One client behind the quick functions, so repeated calls reuse keep-alive
+# connections; it never stores response cookies, keeping calls independent
+_shared_client: Optional[StealthClient] = None
+_shared_lock = threading.Lock()
+
+
+def _shared() -> StealthClient:
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = StealthClient(RequestConfig(persist_cookies=False))
+        return _shared_client
+
+
+def close_shared():
+    """Close the client used by get()/post()/fetch()/fetch_json()."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+
+
 def get(url: str, **kwargs) -> requests.Response:
     """Quick GET request."""
-    with StealthClient() as client:
-        return client.get(url, **kwargs)
+    return _shared().get(url, **kwargs)
 
 
 def post(url: str, **kwargs) -> requests.Response:
     """Quick POST request."""
-    with StealthClient() as client:
-        return client.post(url, **kwargs)
+    return _shared().post(url, **kwargs)
 
 
 def fetch(url: str, **kwargs) -> str:
@@ -463,4 +744,4 @@ def fetch(url: str, **kwargs) -> str:
 
 def fetch_json(url: str, **kwargs) -> Any:
     """Quick fetch JSON."""
-    return get(url, **kwargs).json()
+    return response_json(get(url, **kwargs))
@@ -5,22 +5,246 @@ scrapers after inspecting the page in a browser.
 """
 import json
 import re
-from typing import Dict, List, Any, Optional, Callable
+import sys
+import functools
+from typing import Dict, List, Any, Optional, Callable, Union
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
 from urllib.parse import urlparse, urljoin
 
 # Optional: BeautifulSoup
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, NavigableString
     BS4_AVAILABLE = True
 except ImportError:
     BS4_AVAILABLE = False
 
+# Optional: lxml for compiled XPath extraction
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Optional: selectolax (lexbor) - fastest backend for request-based inspection
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
 from .browser import StealthBrowser
 from .http import StealthClient
+from .utils import DATACLASS_SLOTS, load_json, save_json
+
+# lxml (C, libxml2) parses far faster than html.parser; the BeautifulSoup
+# fallback below only runs without lxml, so it needs the stdlib parser then
+_PARSER = "lxml" if LXML_AVAILABLE else "html.parser"
+
+# URL literals passed to fetch()/axios/.get()/.post()/XHR open(): one scan per script
+_API_RE = re.compile(
+    r'(?:fetch\s*\(\s*'
+    r'|axios\.[a-z]+\s*\(\s*'
+    r'|\.get\s*\(\s*'
+    r'|\.post\s*\(\s*'
+    r'|XMLHttpRequest.*?open\s*\(\s*["\'][^"\']+["\']\s*,\s*)'
+    r'["\']([^"\']+)["\']',
+    re.IGNORECASE,
+)
+
+if LXML_AVAILABLE:
+    # Compiled once at import; evaluation runs entirely inside libxml2
+    _HTML_PARSER = lxml_html.HTMLParser(collect_ids=False, huge_tree=False)
+    _XP_TITLE = etree.XPath("string(//title)")
+    _XP_TEXT = etree.XPath("//text()[not(parent::script) and not(parent::style)]")
+    _XP_FORMS = etree.XPath("//form")
+    _XP_INPUTS = etree.XPath(".//input|.//select|.//textarea")
+    _XP_OPTIONS = etree.XPath(".//option")
+    _XP_LINKS = etree.XPath("//a[@href]")
+    _XP_IMGS = etree.XPath("//img")
+    _XP_SCRIPTS = etree.XPath("//script")
+    _XP_STYLESHEETS = etree.XPath(
+        "//link[@href][contains(concat(' ', normalize-space(@rel), ' '), ' stylesheet ')]"
+    )
+    _XP_META = etree.XPath("//meta[@name or @property]")
+    _XP_TABLES = etree.XPath("//table")
+    _XP_ROWS = etree.XPath(".//tr")
+    _XP_CELLS = etree.XPath(".//td|.//th")
+    _XP_CELL_LINKS = etree.XPath(".//a[@href]")
+
+# One round trip for everything _analyze_page needs from a live page. Rules
+# mirror the parser paths: raw attribute values, bs4-style stripped text,
+# and the same CSS-selector construction as _build_css_selector.
+_DOM_SNAPSHOT_JS = """
+() => {
+    const attr = (el, name) => el.getAttribute(name);
+    const classes = (el) => (attr(el, "class") || "").split(/\\s+/).filter(Boolean);
+    const text = (el) => {
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        let out = "";
+        for (let n = walker.nextNode(); n; n = walker.nextNode()) out += n.nodeValue.trim();
+        return out;
+    };
+    const prefixes = new Map();
+    const prefix = (parent) => {
+        const chain = [];
+        let out = "";
+        while (parent && parent.nodeType === 1 && !["html", "body"].includes(parent.localName)) {
+            if (prefixes.has(parent)) { out = prefixes.get(parent); break; }
+            const cls = classes(parent);
+            if (attr(parent, "id")) { out = "#" + attr(parent, "id"); prefixes.set(parent, out); break; }
+            if (cls.length) { out = parent.localName + "." + cls[0]; prefixes.set(parent, out); break; }
+            chain.push(parent);
+            parent = parent.parentNode;
+        }
+        for (const node of chain.reverse()) {
+            out = out ? out + " > " + node.localName : node.localName;
+            prefixes.set(node, out);
+        }
+        return out;
+    };
+    const selector = (el) => {
+        if (attr(el, "id")) return "#" + attr(el, "id");
+        const cls = classes(el);
+        if (cls.length) return el.localName + "." + cls.join(".");
+        const p = prefix(el.parentNode);
+        return p ? p + " > " + el.localName : el.localName;
+    };
+    const all = (root, sel) => Array.from(root.querySelectorAll(sel));
+    
+    return JSON.stringify({
+        text: document.body ? document.body.innerText : null,
+        fields: all(document, "form").flatMap((form) =>
+            all(form, "input, select, textarea").filter((el) => attr(el, "name")).map((el) => [
+                attr(el, "name"), attr(el, "type"), attr(el, "id"), selector(el),
+                el.hasAttribute("required"), attr(el, "value"),
+                el.localName === "select"
+                    ? all(el, "option").map((o) => [attr(o, "value") || "", text(o)])
+                    : [],
+            ])),
+        links: all(document, "a[href]").map((a) => [text(a), attr(a, "href"), selector(a)]),
+        images: all(document, "img").map((img) => [attr(img, "src") || "", attr(img, "alt"), selector(img)]),
+        tables: all(document, "table").map((table) => all(table, "tr").map((row) =>
+            all(row, "td, th").map((cell) => [text(cell), all(cell, "a[href]").map((a) => attr(a, "href"))]))),
+        scripts: all(document, "script").map((s) => [attr(s, "src"), s.text]),
+        stylesheets: all(document, "link[href]")
+            .filter((l) => (attr(l, "rel") || "").split(/\\s+/).includes("stylesheet") && attr(l, "href"))
+            .map((l) => attr(l, "href")),
+        meta: all(document, "meta").map((m) => [attr(m, "name"), attr(m, "property"), attr(m, "content")]),
+    });
+}
+"""
+
+# Elements _inspect_stream reacts to; inputs are read from their <form> subtree
+_STREAM_TAGS = ("title", "meta", "link", "script", "a", "img", "form")
+
+
+@functools.lru_cache(maxsize=4096)
+def _urljoin_cached(base: str, rel: str) -> str:
+    """urljoin memoized: pages repeat the same base and many of the same hrefs."""
+    return urljoin(base, rel)
+
+
+@functools.lru_cache(maxsize=1024)
+def _netloc(url: str) -> str:
+    return urlparse(url).netloc
+
+
+def _dedupe_urls(structure: "PageStructure") -> "PageStructure":
+    """Drop repeated link hrefs, scripts and stylesheets (first occurrence wins)."""
+    seen_hrefs = set()
+    links = []
+    for link in structure.links:
+        if link.href not in seen_hrefs:
+            seen_hrefs.add(link.href)
+            links.append(link)
+    structure.links = links
+    structure.scripts = list(dict.fromkeys(structure.scripts))
+    structure.stylesheets = list(dict.fromkeys(structure.stylesheets))
+    return structure
+
+
+def _parse_lxml(markup):
+    """Parse HTML into an lxml tree (None for empty documents)."""
+    if isinstance(markup, str):
+        try:
+            return etree.fromstring(markup, _HTML_PARSER)
+        except ValueError:
+            # str input with an <?xml encoding=...?> declaration
+            markup = markup.encode("utf-8")
+    return etree.fromstring(markup, _HTML_PARSER)
+
 
+def _lxml_form_field(inp) -> "FormField":
+    """Build a FormField from an lxml input/select/textarea element."""
+    field = FormField(
+        name=inp.get("name", ""),
+        type=sys.intern(inp.get("type", "text")),
+        id=inp.get("id"),
+        required=inp.get("required") is not None,
+        value=inp.get("value"),
+    )
+    
+    if inp.tag == "select":
+        for opt in _XP_OPTIONS(inp):
+            field.options.append({
+                "value": opt.get("value", ""),
+                "text": _lxml_text(opt)
+            })
+    
+    return field
+
+
+def _lxml_text(el) -> str:
+    """lxml equivalent of bs4's ``get_text(strip=True)``."""
+    if not len(el):
+        return (el.text or "").strip()  # text-only leaf, the common table cell
+    return "".join(t.strip() for t in el.itertext())
+
+
+def _bounded_text(strings, limit: int = 5000) -> str:
+    """Newline-join stripped strings, stopping once ``limit`` chars are reached.
+    
+    Same result as ``"\n".join(s for s in strings if s)[:limit]`` without
+    building the text of the whole document first.
+    """
+    buf = []
+    n = 0
+    for s in strings:
+        if not s:
+            continue
+        buf.append(s)
+        n += len(s) + 1
+        if n > limit:  # joined length is n - 1
+            break
+    return "\n".join(buf)[:limit]
+
+
+def _bs4_text(el) -> str:
+    """``el.get_text(strip=True)`` with a shortcut for single-string tags."""
+    string = el.string
+    if type(string) is NavigableString:
+        return string.strip()
+    return "".join(el.stripped_strings)
+
+
+def _collect_tags(soup, names) -> Dict[str, list]:
+    """Group a BeautifulSoup tree's tags by name in one walk (document order)."""
+    found = {name: [] for name in names}
+    for el in soup.descendants:
+        bucket = found.get(el.name)
+        if bucket is not None:
+            bucket.append(el)
+    return found
 
-@dataclass
+
+def _is_stylesheet(link) -> bool:
+    attrs = link.attrs
+    return "stylesheet" in (attrs.get("rel") or ()) and bool(attrs.get("href"))
+
+
+@dataclass(**DATACLASS_SLOTS)
 class FormField:
     """Represents a form field."""
     name: str
@@ -34,7 +258,7 @@ class FormField:
     options: List[Dict[str, str]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Link:
     """Represents a link."""
     text: str
@@ -42,7 +266,7 @@ class Link:
     css_selector: str = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Image:
     """Represents an image."""
     src: str
@@ -50,7 +274,7 @@ class Image:
     css_selector: str = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PageElement:
     """Represents a page element."""
     tag: str
@@ -74,7 +298,7 @@ class PageElement:
         return self.tag
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PageStructure:
     """Complete page structure analysis."""
     url: str
@@ -92,6 +316,95 @@ class PageStructure:
     ajax_patterns: List[str] = field(default_factory=list)
 
 
+# ============ Scraper templates ============
+
+# Invariant blocks of generate_scraper output, built once at import; only the
+# structure-specific lines are formatted per call.
+_PREAMBLE_BODY = '''
+# Headers to mimic browser
+client.headers.update({
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+})
+
+
+def get_page(path: str = "") -> BeautifulSoup:
+    """Fetch a page and return parsed HTML."""
+    url = urljoin(BASE_URL, path)
+    response = client.get(url)
+    response.raise_for_status()
+    return BeautifulSoup(response.text, "lxml")
+
+
+def get_json(path: str, **kwargs) -> dict:
+    """Fetch JSON API endpoint."""
+    url = urljoin(BASE_URL, path)
+    response = client.get(url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+'''
+
+# target -> (text before BASE_URL's value, text after it)
+_SCRAPER_PREAMBLES = {
+    module: (
+        f'import {module}\nfrom bs4 import BeautifulSoup\nfrom urllib.parse import urljoin\n\nBASE_URL = "',
+        f'"\n\n{client_init}\n' + _PREAMBLE_BODY,
+    )
+    for module, client_init in (
+        ("requests", "client = requests.Session()"),
+        ("httpx", "client = httpx.Client()"),
+    )
+}
+
+_FORM_BLOCK = '''
+
+def submit_form(data: dict) -> BeautifulSoup:
+    """Submit form with data."""
+    response = client.post(BASE_URL, data=data)
+    response.raise_for_status()
+    return BeautifulSoup(response.text, "lxml")
+
+'''
+
+_TABLE_BLOCK = '''
+def parse_table(soup) -> list:
+    """Parse table into list of dicts."""
+    rows = soup.select("table tr")
+    if not rows:
+        return []
+    
+    headers = [th.get_text(strip=True) for th in rows[0].find_all(["th", "td"])]
+    data = []
+    
+    for row in rows[1:]:
+        cells = row.find_all(["td", "th"])
+        row_data = {headers[i]: cells[i].get_text(strip=True) for i in range(min(len(cells), len(headers)))}
+        data.append(row_data)
+    
+    return data
+
+'''
+
+_API_BLOCK = '''
+def fetch_api(endpoint: str, **kwargs) -> dict:
+    """Fetch from API endpoint."""
+    url = urljoin(BASE_URL, endpoint)
+    response = client.get(url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+'''
+
+_MAIN_BLOCK = '''
+
+if __name__ == "__main__":
+    soup = get_page()
+    print(f"Title: {soup.title.string if soup.title else 'N/A'}")
+    client.close()
+'''
+
+
 class PageInspector:
     """Inspect page structure for AI-assisted scraping.
     
@@ -107,13 +420,34 @@ class PageInspector:
     
     def __init__(self, browser: StealthBrowser = None):
         self.browser = browser
+        self._http: Optional[StealthClient] = None
+    
+    def _client(self) -> StealthClient:
+        """Shared StealthClient, so repeated inspections reuse pooled connections."""
+        if self._http is None:
+            self._http = StealthClient()
+        return self._http
+    
+    def close(self):
+        """Close the HTTP client used for requests-mode inspection."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+    
+    def __enter__(self):
+        return self
     
-    def inspect(self, url: str, browser: StealthBrowser = None) -> PageStructure:
+    def __exit__(self, *args):
+        self.close()
+    
+    def inspect(self, url: str, browser: StealthBrowser = None, stream: bool = False) -> PageStructure:
         """Inspect page and return structure.
         
         Args:
             url: URL to inspect
             browser: Optional existing browser instance
+            stream: Parse the response incrementally without keeping the
+                whole DOM (requests mode with lxml only; body_text is not set)
         
         Returns:
             PageStructure with full analysis
@@ -121,9 +455,39 @@ class PageInspector:
         browser = browser or self.browser
         
         if browser:
-            return self._inspect_browser(url, browser)
+            structure = self._inspect_browser(url, browser)
+        elif stream and LXML_AVAILABLE:
+            structure = self._inspect_stream(url)
         else:
-            return self._inspect_requests(url)
+            structure = self._inspect_requests(url)
+        return _dedupe_urls(structure)
+    
+    def inspect_many(self, urls: List[str], max_workers: int = 16,
+                     stream: bool = False) -> List[Union[PageStructure, Exception]]:
+        """Inspect many URLs concurrently in requests mode.
+        
+        Workers share this inspector's pooled client; socket reads and
+        lxml parsing release the GIL, so throughput scales with workers.
+        
+        Args:
+            urls: URLs to inspect
+            max_workers: Inspections in flight at once
+            stream: Use streaming inspection (see inspect())
+        
+        Returns:
+            Per URL, in order: the PageStructure, or the exception raised
+        """
+        inspect_one = self._inspect_stream if stream and LXML_AVAILABLE else self._inspect_requests
+        self._client()  # create before fanning out so workers share one pool
+        
+        def run(url):
+            try:
+                return _dedupe_urls(inspect_one(url))
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as pool:
+            return list(pool.map(run, urls))
     
     def _inspect_browser(self, url: str, browser: StealthBrowser) -> PageStructure:
         """Inspect using browser."""
@@ -132,81 +496,303 @@ class PageInspector:
     
     def _inspect_requests(self, url: str) -> PageStructure:
         """Inspect using requests."""
-        from .http import StealthClient
+        response = self._client().get(url)
         
-        client = StealthClient()
-        response = client.get(url)
+        if SELECTOLAX_AVAILABLE:
+            return self._extract_selectolax(response.text, url)
+        if LXML_AVAILABLE:
+            return self._extract_lxml(response.text, url)
         
-        soup = BeautifulSoup(response.text, "html.parser")
+        # Raw bytes plus the HTTP charset: no decode here, no re-sniffing in bs4
+        soup = BeautifulSoup(response.content, features=_PARSER, from_encoding=response.encoding)
         
         structure = PageStructure(
             url=url,
             title=soup.title.string if soup.title else None,
-            body_text=soup.get_text(separator="\n", strip=True)[:5000],
+            body_text=_bounded_text(soup.stripped_strings),
         )
         
+        tags = _collect_tags(soup, ("form", "a", "img", "script", "link", "meta"))
+        
         # Forms
-        for form in soup.find_all("form"):
+        for form in tags["form"]:
             for inp in form.find_all(["input", "select", "textarea"]):
+                attrs = inp.attrs
                 field = FormField(
-                    name=inp.get("name", ""),
-                    type=inp.get("type", "text"),
-                    id=inp.get("id"),
-                    required=inp.get("required") is not None,
-                    value=inp.get("value"),
+                    name=attrs.get("name", ""),
+                    type=sys.intern(attrs.get("type", "text")),
+                    id=attrs.get("id"),
+                    required=attrs.get("required") is not None,
+                    value=attrs.get("value"),
                 )
                 
                 if inp.name == "select":
                     for opt in inp.find_all("option"):
                         field.options.append({
-                            "value": opt.get("value", ""),
-                            "text": opt.get_text(strip=True)
+                            "value": opt.attrs.get("value", ""),
+                            "text": _bs4_text(opt)
                         })
                 
                 structure.forms.append(field)
         
         # Links
-        for a in soup.find_all("a", href=True):
+        for a in tags["a"]:
+            href = a.attrs.get("href")
+            if href is None:
+                continue
+            structure.links.append(Link(
+                text=_bs4_text(a),
+                href=_urljoin_cached(url, href)
+            ))
+        
+        # Images
+        for img in tags["img"]:
+            attrs = img.attrs
+            structure.images.append(Image(
+                src=_urljoin_cached(url, attrs.get("src", "")),
+                alt=attrs.get("alt")
+            ))
+        
+        # Scripts
+        for script in tags["script"]:
+            src = script.attrs.get("src")
+            if src is not None:
+                structure.scripts.append(src)
+        
+        # Stylesheets
+        for link in tags["link"]:
+            if _is_stylesheet(link):
+                structure.stylesheets.append(_urljoin_cached(url, link.attrs["href"]))
+        
+        # Meta
+        for meta in tags["meta"]:
+            attrs = meta.attrs
+            if attrs.get("name"):
+                structure.meta[sys.intern(attrs["name"])] = attrs.get("content")
+            elif attrs.get("property"):
+                structure.meta[sys.intern(attrs["property"])] = attrs.get("content")
+        
+        # API endpoints (heuristics)
+        structure.api_endpoints = self._find_api_endpoints(tags["script"], url)
+        
+        return structure
+    
+    def _inspect_stream(self, url: str) -> PageStructure:
+        """Inspect using requests, parsing the body as it arrives.
+        
+        Handled elements are cleared (and their earlier siblings dropped)
+        right after use, so memory follows the open ancestors rather than
+        the whole document. Form subtrees are kept until the form closes.
+        """
+        response = self._client().get(url, stream=True)
+        response.raw.decode_content = True
+        
+        # Only trust an explicit charset; otherwise let libxml2 sniff <meta>
+        content_type = response.headers.get("content-type", "").lower()
+        encoding = response.encoding if "charset" in content_type else None
+        
+        structure = PageStructure(url=url, title=None)
+        scripts = []
+        open_forms = 0
+        
+        try:
+            events = etree.iterparse(
+                response.raw, events=("start", "end"), tag=_STREAM_TAGS,
+                html=True, encoding=encoding, collect_ids=False,
+            )
+            for event, elem in events:
+                tag = elem.tag
+                if event == "start":
+                    if tag == "form":
+                        open_forms += 1
+                    continue
+                
+                if tag == "form":
+                    open_forms -= 1
+                    for inp in _XP_INPUTS(elem):
+                        structure.forms.append(_lxml_form_field(inp))
+                elif tag == "a":
+                    if elem.get("href") is not None:
+                        structure.links.append(Link(
+                            text=_lxml_text(elem),
+                            href=_urljoin_cached(url, elem.get("href"))
+                        ))
+                elif tag == "img":
+                    structure.images.append(Image(
+                        src=_urljoin_cached(url, elem.get("src", "")),
+                        alt=elem.get("alt")
+                    ))
+                elif tag == "script":
+                    src = elem.get("src")
+                    scripts.append((src, elem.text or ""))
+                    if src:
+                        structure.scripts.append(src)
+                elif tag == "link":
+                    if "stylesheet" in (elem.get("rel") or "").split() and elem.get("href"):
+                        structure.stylesheets.append(_urljoin_cached(url, elem.get("href")))
+                elif tag == "meta":
+                    key = elem.get("name") or elem.get("property")
+                    if key:
+                        structure.meta[sys.intern(key)] = elem.get("content")
+                elif tag == "title" and structure.title is None:
+                    structure.title = elem.text
+                
+                if open_forms:
+                    continue
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        except etree.XMLSyntaxError:
+            # Empty or truncated body: keep whatever was emitted so far
+            pass
+        finally:
+            response.close()
+        
+        structure.api_endpoints = self._endpoints_from_scripts(scripts, url)
+        
+        return structure
+    
+    def _extract_lxml(self, html: str, url: str) -> PageStructure:
+        """Extract page structure with precompiled lxml XPath expressions."""
+        root = _parse_lxml(html)
+        if root is None:
+            return PageStructure(url=url, title=None, body_text="")
+        
+        texts = (t.strip() for t in _XP_TEXT(root))
+        structure = PageStructure(
+            url=url,
+            title=_XP_TITLE(root) or None,
+            body_text=_bounded_text(texts),
+        )
+        
+        # Forms
+        for form in _XP_FORMS(root):
+            for inp in _XP_INPUTS(form):
+                structure.forms.append(_lxml_form_field(inp))
+        
+        # Links
+        for a in _XP_LINKS(root):
             structure.links.append(Link(
-                text=a.get_text(strip=True),
-                href=urljoin(url, a["href"])
+                text=_lxml_text(a),
+                href=_urljoin_cached(url, a.get("href"))
             ))
         
         # Images
-        for img in soup.find_all("img"):
+        for img in _XP_IMGS(root):
             structure.images.append(Image(
-                src=urljoin(url, img.get("src", "")),
+                src=_urljoin_cached(url, img.get("src", "")),
                 alt=img.get("alt")
             ))
         
         # Scripts
-        for script in soup.find_all("script", src=True):
-            structure.scripts.append(script["src"])
+        for script in _XP_SCRIPTS(root):
+            if script.get("src"):
+                structure.scripts.append(script.get("src"))
         
         # Stylesheets
-        for link in soup.find_all("link", rel="stylesheet"):
-            if link.get("href"):
-                structure.stylesheets.append(urljoin(url, link["href"]))
+        for link in _XP_STYLESHEETS(root):
+            structure.stylesheets.append(_urljoin_cached(url, link.get("href")))
         
         # Meta
-        for meta in soup.find_all("meta"):
+        for meta in _XP_META(root):
             if meta.get("name"):
-                structure.meta[meta["name"]] = meta.get("content")
+                structure.meta[sys.intern(meta.get("name"))] = meta.get("content")
             elif meta.get("property"):
-                structure.meta[meta["property"]] = meta.get("content")
+                structure.meta[sys.intern(meta.get("property"))] = meta.get("content")
         
         # API endpoints (heuristics)
-        structure.api_endpoints = self._find_api_endpoints(soup, url)
+        structure.api_endpoints = self._find_api_endpoints(root, url)
+        
+        return structure
+    
+    def _extract_selectolax(self, html: str, url: str) -> PageStructure:
+        """Extract page structure with selectolax's lexbor parser."""
+        tree = LexborHTMLParser(html)
+        title = tree.css_first("title")
+        
+        structure = PageStructure(url=url, title=title.text() if title else None)
+        
+        # Forms
+        for inp in tree.css("form input, form select, form textarea"):
+            attrs = inp.attributes
+            field = FormField(
+                name=attrs.get("name") or "",
+                type=sys.intern(attrs.get("type") or "text"),
+                id=attrs.get("id"),
+                required="required" in attrs,
+                value=attrs.get("value"),
+            )
+            
+            if inp.tag == "select":
+                for opt in inp.css("option"):
+                    field.options.append({
+                        "value": opt.attributes.get("value") or "",
+                        "text": opt.text(separator="", strip=True)
+                    })
+            
+            structure.forms.append(field)
+        
+        # Links
+        for a in tree.css("a[href]"):
+            structure.links.append(Link(
+                text=a.text(separator="", strip=True),
+                href=_urljoin_cached(url, a.attributes["href"] or "")
+            ))
+        
+        # Images
+        for img in tree.css("img"):
+            structure.images.append(Image(
+                src=_urljoin_cached(url, img.attributes.get("src") or ""),
+                alt=img.attributes.get("alt")
+            ))
+        
+        # Scripts
+        for script in tree.css("script[src]"):
+            if script.attributes["src"]:
+                structure.scripts.append(script.attributes["src"])
+        
+        # Stylesheets
+        for link in tree.css("link[rel~=stylesheet][href]"):
+            structure.stylesheets.append(_urljoin_cached(url, link.attributes["href"]))
+        
+        # Meta
+        for meta in tree.css("meta"):
+            attrs = meta.attributes
+            if attrs.get("name"):
+                structure.meta[sys.intern(attrs["name"])] = attrs.get("content")
+            elif attrs.get("property"):
+                structure.meta[sys.intern(attrs["property"])] = attrs.get("content")
+        
+        # API endpoints (heuristics), before scripts are stripped for the text
+        structure.api_endpoints = self._find_api_endpoints(tree, url)
+        
+        tree.strip_tags(["script", "style"])
+        text = tree.root.text(separator="\n", strip=True) if tree.root else ""
+        structure.body_text = "\n".join(t for t in text.split("\n") if t)[:5000]
         
         return structure
     
     def _analyze_page(self, browser: StealthBrowser) -> PageStructure:
         """Analyze page from browser instance."""
+        base_url = browser.url
+        try:
+            snapshot = browser.eval(_DOM_SNAPSHOT_JS)
+        except Exception:
+            snapshot = None
+        if snapshot:
+            return self._analyze_snapshot(browser, json.loads(snapshot), base_url)
+        
+        # No usable snapshot (e.g. Selenium, which needs a "return" body): parse the HTML
         html = browser.html()
-        soup = BeautifulSoup(html, "html.parser")
+        if LXML_AVAILABLE:
+            root = _parse_lxml(html)
+            if root is not None:
+                return self._analyze_lxml(browser, root, base_url)
+        
+        soup = BeautifulSoup(html, features=_PARSER)
         
         structure = PageStructure(
-            url=browser.url,
+            url=base_url,
             title=browser.title,
         )
         
@@ -214,108 +800,324 @@ class PageInspector:
         try:
             structure.body_text = browser.eval("document.body.innerText").strip()[:5000]
         except:
-            structure.body_text = soup.get_text(separator="\n", strip=True)[:5000]
+            structure.body_text = _bounded_text(soup.stripped_strings)
+        
+        tags = _collect_tags(soup, ("form", "a", "img", "table", "script", "link", "meta"))
+        css_prefixes: Dict[int, str] = {}
         
         # Forms with more detail
-        for i, form in enumerate(soup.find_all("form")):
+        for i, form in enumerate(tags["form"]):
             form_id = form.get("id") or f"form-{i}"
             
             for inp in form.find_all(["input", "select", "textarea"]):
-                name = inp.get("name", "")
+                attrs = inp.attrs
+                name = attrs.get("name", "")
                 if not name:
                     continue
                 
                 # Build CSS selector
-                css_sel = self._build_css_selector(inp)
+                css_sel = self._build_css_selector(inp, css_prefixes)
                 
                 field = FormField(
                     name=name,
-                    type=inp.get("type", "text"),
-                    id=inp.get("id"),
+                    type=sys.intern(attrs.get("type", "text")),
+                    id=attrs.get("id"),
                     css_selector=css_sel,
-                    required=inp.get("required") is not None,
-                    value=inp.get("value"),
+                    required=attrs.get("required") is not None,
+                    value=attrs.get("value"),
                 )
                 
                 if inp.name == "select":
                     for opt in inp.find_all("option"):
+                        field.options.append({
+                            "value": opt.attrs.get("value", ""),
+                            "text": _bs4_text(opt)
+                        })
+                
+                structure.forms.append(field)
+        
+        # Links
+        for a in tags["a"]:
+            href = a.attrs.get("href")
+            if href is None:
+                continue
+            structure.links.append(Link(
+                text=_bs4_text(a),
+                href=_urljoin_cached(base_url, href),
+                css_selector=self._build_css_selector(a, css_prefixes)
+            ))
+        
+        # Images
+        for img in tags["img"]:
+            attrs = img.attrs
+            structure.images.append(Image(
+                src=_urljoin_cached(base_url, attrs.get("src", "")),
+                alt=attrs.get("alt"),
+                css_selector=self._build_css_selector(img, css_prefixes)
+            ))
+        
+        # Tables
+        for table in tags["table"]:
+            table_data = self._parse_table(table, base_url)
+            if table_data:
+                structure.tables.append(table_data)
+        
+        # Scripts
+        for script in tags["script"]:
+            src = script.attrs.get("src")
+            if src is not None:
+                structure.scripts.append(src)
+        
+        # Stylesheets
+        for link in tags["link"]:
+            if _is_stylesheet(link):
+                structure.stylesheets.append(_urljoin_cached(base_url, link.attrs["href"]))
+        
+        # Meta
+        for meta in tags["meta"]:
+            attrs = meta.attrs
+            if attrs.get("name"):
+                structure.meta[sys.intern(attrs["name"])] = attrs.get("content")
+            elif attrs.get("property"):
+                structure.meta[sys.intern(attrs["property"])] = attrs.get("content")
+        
+        # API endpoints
+        structure.api_endpoints = self._find_api_endpoints(tags["script"], base_url)
+        
+        # AJAX patterns
+        structure.ajax_patterns = self._find_ajax_patterns(browser)
+        
+        return structure
+    
+    def _analyze_snapshot(self, browser: StealthBrowser, snap: Dict[str, Any], base_url: str) -> PageStructure:
+        """Build a PageStructure from the browser's _DOM_SNAPSHOT_JS result."""
+        structure = PageStructure(
+            url=base_url,
+            title=browser.title,
+            body_text=(snap["text"] or "").strip()[:5000],
+        )
+        
+        # Forms with more detail
+        for name, type_, id_, css_sel, required, value, options in snap["fields"]:
+            structure.forms.append(FormField(
+                name=name,
+                type=sys.intern(type_ if type_ is not None else "text"),
+                id=id_,
+                css_selector=css_sel,
+                required=required,
+                value=value,
+                options=[{"value": v, "text": t} for v, t in options],
+            ))
+        
+        # Links
+        for text, href, css_sel in snap["links"]:
+            structure.links.append(Link(
+                text=text,
+                href=_urljoin_cached(base_url, href),
+                css_selector=css_sel
+            ))
+        
+        # Images
+        for src, alt, css_sel in snap["images"]:
+            structure.images.append(Image(
+                src=_urljoin_cached(base_url, src),
+                alt=alt,
+                css_selector=css_sel
+            ))
+        
+        # Tables
+        for rows in snap["tables"]:
+            table_data = self._table_from_rows(rows, base_url)
+            if table_data:
+                structure.tables.append(table_data)
+        
+        # Scripts
+        scripts = snap["scripts"]
+        structure.scripts = [src for src, _ in scripts if src is not None]
+        
+        # Stylesheets
+        structure.stylesheets = [_urljoin_cached(base_url, href) for href in snap["stylesheets"]]
+        
+        # Meta
+        for name, prop, content in snap["meta"]:
+            if name:
+                structure.meta[sys.intern(name)] = content
+            elif prop:
+                structure.meta[sys.intern(prop)] = content
+        
+        # API endpoints
+        structure.api_endpoints = self._endpoints_from_scripts(scripts, base_url)
+        
+        # AJAX patterns
+        structure.ajax_patterns = self._find_ajax_patterns(browser)
+        
+        return structure
+    
+    def _analyze_lxml(self, browser: StealthBrowser, root, base_url: str) -> PageStructure:
+        """Analyze a browser page's parsed lxml tree with precompiled XPath."""
+        structure = PageStructure(
+            url=base_url,
+            title=browser.title,
+        )
+        
+        try:
+            structure.body_text = browser.eval("document.body.innerText").strip()[:5000]
+        except:
+            texts = (t.strip() for t in _XP_TEXT(root))
+            structure.body_text = _bounded_text(texts)
+        
+        css_prefixes: Dict[Any, str] = {}
+        
+        # Forms with more detail
+        for form in _XP_FORMS(root):
+            for inp in _XP_INPUTS(form):
+                name = inp.get("name", "")
+                if not name:
+                    continue
+                
+                field = FormField(
+                    name=name,
+                    type=sys.intern(inp.get("type", "text")),
+                    id=inp.get("id"),
+                    css_selector=self._build_lxml_selector(inp, css_prefixes),
+                    required=inp.get("required") is not None,
+                    value=inp.get("value"),
+                )
+                
+                if inp.tag == "select":
+                    for opt in _XP_OPTIONS(inp):
                         field.options.append({
                             "value": opt.get("value", ""),
-                            "text": opt.get_text(strip=True)
+                            "text": _lxml_text(opt)
                         })
                 
                 structure.forms.append(field)
         
         # Links
-        for a in soup.find_all("a", href=True):
+        for a in _XP_LINKS(root):
             structure.links.append(Link(
-                text=a.get_text(strip=True),
-                href=urljoin(browser.url, a["href"]),
-                css_selector=self._build_css_selector(a)
+                text=_lxml_text(a),
+                href=_urljoin_cached(base_url, a.get("href")),
+                css_selector=self._build_lxml_selector(a, css_prefixes)
             ))
         
         # Images
-        for img in soup.find_all("img"):
+        for img in _XP_IMGS(root):
             structure.images.append(Image(
-                src=urljoin(browser.url, img.get("src", "")),
+                src=_urljoin_cached(base_url, img.get("src", "")),
                 alt=img.get("alt"),
-                css_selector=self._build_css_selector(img)
+                css_selector=self._build_lxml_selector(img, css_prefixes)
             ))
         
         # Tables
-        for table in soup.find_all("table"):
-            table_data = self._parse_table(table, browser.url)
+        for table in _XP_TABLES(root):
+            table_data = self._parse_table_lxml(table, base_url)
             if table_data:
                 structure.tables.append(table_data)
         
         # Scripts
-        for script in soup.find_all("script", src=True):
-            structure.scripts.append(script["src"])
+        for script in _XP_SCRIPTS(root):
+            if script.get("src") is not None:
+                structure.scripts.append(script.get("src"))
         
         # Stylesheets
-        for link in soup.find_all("link", rel="stylesheet"):
-            if link.get("href"):
-                structure.stylesheets.append(urljoin(browser.url, link["href"]))
+        for link in _XP_STYLESHEETS(root):
+            structure.stylesheets.append(_urljoin_cached(base_url, link.get("href")))
         
         # Meta
-        for meta in soup.find_all("meta"):
+        for meta in _XP_META(root):
             if meta.get("name"):
-                structure.meta[meta["name"]] = meta.get("content")
+                structure.meta[sys.intern(meta.get("name"))] = meta.get("content")
             elif meta.get("property"):
-                structure.meta[meta["property"]] = meta.get("content")
+                structure.meta[sys.intern(meta.get("property"))] = meta.get("content")
         
         # API endpoints
-        structure.api_endpoints = self._find_api_endpoints(soup, browser.url)
+        structure.api_endpoints = self._find_api_endpoints(root, base_url)
         
         # AJAX patterns
         structure.ajax_patterns = self._find_ajax_patterns(browser)
         
         return structure
     
-    def _build_css_selector(self, element) -> str:
-        """Build CSS selector for element."""
+    def _build_lxml_selector(self, element, parent_cache: Dict[Any, str]) -> str:
+        """Build CSS selector for an lxml element (same rules as _build_css_selector).
+        
+        The cache is keyed by the ancestor elements themselves: holding them
+        keeps lxml's proxies alive, so identity stays stable for the tree.
+        """
         if element.get("id"):
-            return f"#{element['id']}"
+            return f"#{element.get('id')}"
         
-        if element.get("class"):
-            classes = " ".join(element.get("class", []))
-            return f"{element.name}.{classes.replace(' ', '.')}"
+        classes = (element.get("class") or "").split()
+        if classes:
+            return f"{element.tag}.{'.'.join(classes)}"
         
-        # Try parents
-        parts = [element.name]
-        parent = element.parent
-        while parent and parent.name not in ["html", "body"]:
+        chain = []
+        prefix = ""
+        parent = element.getparent()
+        while parent is not None and parent.tag not in ("html", "body"):
+            cached = parent_cache.get(parent)
+            if cached is not None:
+                prefix = cached
+                break
             if parent.get("id"):
-                parts.append(f"#{parent['id']}")
+                prefix = parent_cache[parent] = f"#{parent.get('id')}"
+                break
+            parent_classes = (parent.get("class") or "").split()
+            if parent_classes:
+                prefix = parent_cache[parent] = f"{parent.tag}.{parent_classes[0]}"
+                break
+            chain.append(parent)
+            parent = parent.getparent()
+        
+        for node in reversed(chain):
+            prefix = parent_cache[node] = f"{prefix} > {node.tag}" if prefix else node.tag
+        return f"{prefix} > {element.tag}" if prefix else element.tag
+    
+    def _build_css_selector(self, element, parent_cache: Dict[int, str] = None) -> str:
+        """Build CSS selector for element.
+        
+        Args:
+            element: BeautifulSoup tag
+            parent_cache: id(ancestor) -> selector prefix, shared across calls
+                on one tree so common ancestor chains are walked once
+        """
+        attrs = element.attrs
+        if attrs.get("id"):
+            return f"#{attrs['id']}"
+        
+        if attrs.get("class"):
+            classes = " ".join(attrs["class"])
+            return f"{element.name}.{classes.replace(' ', '.')}"
+        
+        prefix = self._css_prefix(element.parent, {} if parent_cache is None else parent_cache)
+        return f"{prefix} > {element.name}" if prefix else element.name
+    
+    def _css_prefix(self, parent, cache: Dict[int, str]) -> str:
+        """Selector for the ancestors above an element ("" at html/body)."""
+        # Walk up to the first anchor (id/class, html/body, or a cached ancestor)
+        chain = []
+        prefix = ""
+        while parent and parent.name not in ("html", "body"):
+            cached = cache.get(id(parent))
+            if cached is not None:
+                prefix = cached
                 break
-            if parent.get("class"):
-                cls = " ".join(parent.get("class", [])[:1])
-                parts.append(f"{parent.name}.{cls}")
+            attrs = parent.attrs
+            if attrs.get("id"):
+                prefix = cache[id(parent)] = f"#{attrs['id']}"
                 break
-            parts.append(parent.name)
+            if attrs.get("class"):
+                cls = " ".join(attrs["class"][:1])
+                prefix = cache[id(parent)] = f"{parent.name}.{cls}"
+                break
+            chain.append(parent)
             parent = parent.parent
         
-        return " > ".join(reversed(parts))
+        # Fill in the plain ancestors on the way back down
+        for node in reversed(chain):
+            prefix = cache[id(node)] = f"{prefix} > {node.name}" if prefix else node.name
+        return prefix
     
     def _parse_table(self, table, base_url: str) -> Dict:
         """Parse table into structured data."""
@@ -325,21 +1127,71 @@ class PageInspector:
         
         # Get headers
         header_row = rows[0]
-        headers = [th.get_text(strip=True) for th in header_row.find_all(["th", "td"])]
+        headers = [_bs4_text(th) for th in header_row.find_all(["th", "td"])]
         
         # Get data rows
         data = []
         for row in rows[1:]:
             cells = row.find_all(["td", "th"])
-            row_data = {}
+            # zip stops at the last header, so surplus cells are never read
+            row_data = dict(zip(headers, map(_bs4_text, cells)))
+            
+            # Check for links in cells
             for i, cell in enumerate(cells):
-                if i < len(headers):
-                    row_data[headers[i]] = cell.get_text(strip=True)
-                
-                # Check for links in cells
                 links = cell.find_all("a", href=True)
                 if links:
-                    row_data[f"_links_{i}"] = [urljoin(base_url, a["href"]) for a in links]
+                    row_data[f"_links_{i}"] = [_urljoin_cached(base_url, a["href"]) for a in links]
+            
+            if row_data:
+                data.append(row_data)
+        
+        return {
+            "headers": headers,
+            "rows": data[:50],  # Limit
+            "row_count": len(data)
+        }
+    
+    def _parse_table_lxml(self, table, base_url: str) -> Dict:
+        """Parse an lxml table element into structured data."""
+        rows = _XP_ROWS(table)
+        if not rows:
+            return None
+        
+        headers = [_lxml_text(cell) for cell in _XP_CELLS(rows[0])]
+        
+        data = []
+        for row in rows[1:]:
+            cells = _XP_CELLS(row)
+            row_data = dict(zip(headers, map(_lxml_text, cells)))
+            
+            for i, cell in enumerate(cells):
+                links = _XP_CELL_LINKS(cell)
+                if links:
+                    row_data[f"_links_{i}"] = [_urljoin_cached(base_url, a.get("href")) for a in links]
+            
+            if row_data:
+                data.append(row_data)
+        
+        return {
+            "headers": headers,
+            "rows": data[:50],  # Limit
+            "row_count": len(data)
+        }
+    
+    def _table_from_rows(self, rows: List[list], base_url: str) -> Dict:
+        """Build table data from snapshot rows of (cell text, cell hrefs) pairs."""
+        if not rows:
+            return None
+        
+        headers = [text for text, _ in rows[0]]
+        
+        data = []
+        for row in rows[1:]:
+            row_data = dict(zip(headers, (text for text, _ in row)))
+            
+            for i, (_, hrefs) in enumerate(row):
+                if hrefs:
+                    row_data[f"_links_{i}"] = [_urljoin_cached(base_url, href) for href in hrefs]
             
             if row_data:
                 data.append(row_data)
@@ -352,35 +1204,49 @@ class PageInspector:
     
     def _find_api_endpoints(self, soup, base_url: str) -> List[str]:
         """Find potential API endpoints."""
-        endpoints = set()
+        if SELECTOLAX_AVAILABLE and isinstance(soup, LexborHTMLParser):
+            scripts = [(s.attributes.get("src"), s.text()) for s in soup.css("script")]
+        elif LXML_AVAILABLE and isinstance(soup, etree._Element):
+            scripts = [(s.get("src"), s.text or "") for s in _XP_SCRIPTS(soup)]
+        elif isinstance(soup, list):
+            # BeautifulSoup <script> tags already collected by the caller
+            scripts = [(s.get("src"), s.get_text()) for s in soup]
+        else:
+            scripts = [(s.get("src"), s.get_text()) for s in soup.find_all("script")]
+        
+        return self._endpoints_from_scripts(scripts, base_url)
+    
+    def _endpoints_from_scripts(self, scripts, base_url: str, limit: int = 20) -> List[str]:
+        """Collect endpoints from (src, inline text) pairs of <script> tags.
+        
+        Stops scanning once ``limit`` endpoints are found; endpoints keep
+        discovery order.
+        """
+        endpoints: Dict[str, None] = {}
         
         # From script tags
-        for script in soup.find_all("script", src=True):
-            src = script["src"]
+        for src, _ in scripts:
+            if not src:
+                continue
             if "api" in src.lower() or "ajax" in src.lower() or ".js" in src:
-                endpoints.add(urljoin(base_url, src))
+                endpoints[_urljoin_cached(base_url, src)] = None
+                if len(endpoints) >= limit:
+                    return list(endpoints)
         
         # From fetch/XHR calls in scripts (heuristic)
-        for script in soup.find_all("script"):
-            text = script.get_text()
-            # Match URL patterns
-            patterns = [
-                r'fetch\s*\(\s*["\']([^"\']+)["\']',
-                r'axios\.[a-z]+\s*\(\s*["\']([^"\']+)["\']',
-                r'\.get\s*\(\s*["\']([^"\']+)["\']',
-                r'\.post\s*\(\s*["\']([^"\']+)["\']',
-                r'XMLHttpRequest.*?open\s*\(\s*["\'][^"\']+["\']\s*,\s*["\']([^"\']+)["\']',
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if match.startswith("http"):
-                        endpoints.add(match)
-                    elif match.startswith("/"):
-                        endpoints.add(urljoin(base_url, match))
+        for _, text in scripts:
+            for m in _API_RE.finditer(text):
+                match = m.group(1)
+                if match.startswith("http"):
+                    endpoints[match] = None
+                elif match.startswith("/"):
+                    endpoints[_urljoin_cached(base_url, match)] = None
+                else:
+                    continue
+                if len(endpoints) >= limit:
+                    return list(endpoints)
         
-        return list(endpoints)[:20]
+        return list(endpoints)
     
     def _find_ajax_patterns(self, browser: StealthBrowser) -> List[str]:
         """Find AJAX/XHR request patterns."""
@@ -418,132 +1284,44 @@ class PageInspector:
         Returns:
             Python code string
         """
-        if target == "httpx":
-            client_code = "import httpx"
-            client_init = "client = httpx.Client()"
-            client_close = "client.close()"
-        else:
-            client_code = "import requests"
-            client_init = "client = requests.Session()"
-            client_close = "client.close()"
-        
-        code = f'''{client_code}
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-
-BASE_URL = "{structure.url}"
-
-{client_init}
-
-# Headers to mimic browser
-client.headers.update({{
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-}})
-
-
-def get_page(path: str = "") -> BeautifulSoup:
-    """Fetch a page and return parsed HTML."""
-    url = urljoin(BASE_URL, path)
-    response = client.get(url)
-    response.raise_for_status()
-    return BeautifulSoup(response.text, "html.parser")
-
-
-def get_json(path: str, **kwargs) -> dict:
-    """Fetch JSON API endpoint."""
-    url = urljoin(BASE_URL, path)
-    response = client.get(url, **kwargs)
-    response.raise_for_status()
-    return response.json()
-
-'''
+        head, tail = _SCRAPER_PREAMBLES["httpx" if target == "httpx" else "requests"]
+        parts = [head, structure.url, tail]
         
         # Add form handling if forms exist
         if structure.forms:
-            code += '''
-# Form fields found:
-'''
+            parts.append("\n# Form fields found:\n")
             for form in structure.forms[:5]:  # Limit to first 5
-                code += f'# - {form.name}: {form.type}'
+                parts.append(f'# - {form.name}: {form.type}')
                 if form.options:
-                    code += f" (options: {len(form.options)})"
-                code += "\n"
+                    parts.append(f" (options: {len(form.options)})")
+                parts.append("\n")
             
-            code += f'''
-
-def submit_form(data: dict) -> BeautifulSoup:
-    """Submit form with data."""
-    response = client.post(BASE_URL, data=data)
-    response.raise_for_status()
-    return BeautifulSoup(response.text, "html.parser")
-
-'''
+            parts.append(_FORM_BLOCK)
         
         # Add link scraping if links exist
         if structure.links:
-            code += '''
-# Links found on page:
-# '''
-            unique_domains = set()
-            for link in structure.links[:10]:
-                if link.href:
-                    domain = urlparse(link.href).netloc
-                    unique_domains.add(domain)
+            parts.append("\n# Links found on page:\n# ")
+            unique_domains = dict.fromkeys(_netloc(link.href) for link in structure.links[:10] if link.href)
             
-            code += ", ".join(unique_domains) + "\n"
+            parts.append(", ".join(unique_domains) + "\n")
         
         # Add table parsing if tables exist
         if structure.tables:
             table = structure.tables[0]
-            code += f'''
-
-# Table with {table.get("row_count", 0)} rows:
-# Headers: {table.get("headers", [])}
-
-def parse_table(soup) -> list:
-    """Parse table into list of dicts."""
-    rows = soup.select("table tr")
-    if not rows:
-        return []
-    
-    headers = [th.get_text(strip=True) for th in rows[0].find_all(["th", "td"])]
-    data = []
-    
-    for row in rows[1:]:
-        cells = row.find_all(["td", "th"])
-        row_data = {headers[i]: cells[i].get_text(strip=True) for i in range(min(len(cells), len(headers)))}
-        data.append(row_data)
-    
-    return data
-
-'''
+            parts.append(f'\n\n# Table with {table.get("row_count", 0)} rows:\n# Headers: {table.get("headers", [])}\n')
+            parts.append(_TABLE_BLOCK)
         
         # Add API endpoints if found
         if structure.api_endpoints:
-            code += "\n# Potential API endpoints:\n"
+            parts.append("\n# Potential API endpoints:\n")
             for endpoint in structure.api_endpoints[:5]:
-                code += f"# - {endpoint}\n"
+                parts.append(f"# - {endpoint}\n")
             
-            code += '''
-def fetch_api(endpoint: str, **kwargs) -> dict:
-    """Fetch from API endpoint."""
-    url = urljoin(BASE_URL, endpoint)
-    response = client.get(url, **kwargs)
-    response.raise_for_status()
-    return response.json()
-
-'''
+            parts.append(_API_BLOCK)
         
-        code += f'''
-
-if __name == "__main__":
-    soup = get_page()
-    print(f"Title: {soup.title.string if soup.title else 'N/A'}")
-    {client_close}
-'''
+        parts.append(_MAIN_BLOCK)
         
-        return code
+        return "".join(parts)
     
     def generate_login_scraper(self, structure: PageStructure, username_field: str = None, password_field: str = None) -> str:
         """Generate code for login flow.
@@ -573,7 +1351,7 @@ session = requests.Session()
 
 # Get login page to extract CSRF token
 resp = session.get(LOGIN_URL)
-soup = BeautifulSoup(resp.text, "html.parser")
+soup = BeautifulSoup(resp.text, "lxml")
 
 # Find CSRF token (common names)
 csrf_token = (
@@ -614,7 +1392,7 @@ def scrape_page(page_num: int) -> list:
     url = f"{{BASE_URL}}?page={{page_num}}"
     
     resp = session.get(url)
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(resp.text, "lxml")
     
     items = []
     for item in soup.select("{list_selector or '.item'}"):
@@ -667,37 +1445,34 @@ class RequestBuilder:
     
     def generate_code(self) -> str:
         """Generate Python code to replicate actions."""
-        code = "import requests\n\n"
-        code += "session = requests.Session()\n\n"
+        parts = ["import requests\n\n", "session = requests.Session()\n\n"]
         
         for action in self.actions:
             if action["action"] == "GET":
-                code += f'# GET {action["data"].get("url")}\n'
-                code += f'response = session.get("{action["data"].get("url")}")\n\n'
+                parts.append(f'# GET {action["data"].get("url")}\n')
+                parts.append(f'response = session.get("{action["data"].get("url")}")\n\n')
             
             elif action["action"] == "POST":
-                code += f'# POST {action["data"].get("url")}\n'
+                parts.append(f'# POST {action["data"].get("url")}\n')
                 data = action["data"].get("data", {})
                 if data:
-                    code += f'data = {json.dumps(data, indent=4)}\n'
-                    code += f'response = session.post("{action["data"].get("url")}", data=data)\n'
+                    parts.append(f'data = {json.dumps(data, indent=4)}\n')
+                    parts.append(f'response = session.post("{action["data"].get("url")}", data=data)\n')
                 else:
-                    code += f'response = session.post("{action["data"].get("url")}")\n'
-                code += "\n"
+                    parts.append(f'response = session.post("{action["data"].get("url")}")\n')
+                parts.append("\n")
             
             elif action["action"] == "CLICK":
-                code += f'# Click: {action["data"].get("selector")}\n'
+                parts.append(f'# Click: {action["data"].get("selector")}\n')
                 # Would need more complex logic
-                code += "# (Click handling requires re-implementing with requests)\n\n"
+                parts.append("# (Click handling requires re-implementing with requests)\n\n")
         
-        return code
+        return "".join(parts)
     
     def export(self, path: str):
         """Export recorded actions to JSON."""
-        with open(path, "w") as f:
-            json.dump(self.actions, f, indent=2)
+        save_json(self.actions, path)
     
     def load(self, path: str):
         """Load actions from JSON."""
-        with open(path, "r") as f:
-            self.actions = json.load(f)
+        self.actions = load_json(path)
@@ -1,12 +1,62 @@
 """Network monitoring and request capture for browser."""
 import json
+import re
+import sys
 import time
-from typing import List, Dict, Any, Optional, Callable
+import functools
+import itertools
+import weakref
+from collections import deque
+from typing import List, Dict, Any, Optional, Callable, Deque
 from dataclasses import dataclass, field
 from urllib.parse import urlparse
 
+from .utils import DATACLASS_SLOTS
 
-@dataclass
+# Optional: orjson for streaming and exporting captured requests
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize compactly to UTF-8 JSON, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+# URL fragments that mark likely API calls (XHR/fetch), matched in one scan
+_API_RE = re.compile(r"/api|/ajax|/graphql|\.json|xhr", re.IGNORECASE)
+
+
+def _has_body(method: str, status: int) -> bool:
+    """Whether a response can carry a body worth fetching from the browser.
+    
+    Playwright raises for redirect bodies; HEAD, 204 and 304 have none.
+    """
+    return method != "HEAD" and status not in (204, 304) and not 300 <= status < 400
+
+
+@functools.lru_cache(maxsize=64)
+def _verb(method: str) -> str:
+    """Upper-cased, interned HTTP method; the set of verbs is tiny."""
+    return sys.intern(method.upper())
+
+
+# Only these reach urlparse; data:/blob: URIs can be megabytes long
+_HTTP_SCHEMES = ("http:", "https:")
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_urlparse(url: str):
+    """urlparse memoized; captured logs repeat the same URLs many times."""
+    return urlparse(url)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class NetworkRequest:
     """Captured network request."""
     id: str
@@ -25,25 +75,47 @@ class NetworkRequest:
 @dataclass 
 class NetworkLog:
     """Complete network log for a page load."""
-    requests: List[NetworkRequest] = field(default_factory=list)
+    requests: Deque[NetworkRequest] = field(default_factory=deque)
     start_time: float = field(default_factory=time.time)
     _file_handle = None
     _stream_to_file: bool = False
     _max_memory_requests: int = 100  # Keep last N in memory
+    _flush_every: int = 50  # Streamed requests buffered between flushes
+    _stream_buffer: int = 1 << 16  # Write buffer for the stream file, in bytes
+    _unflushed: int = 0
+    # Column views of requests (url, upper-cased method), kept index-aligned by
+    # _add_request so filters and summaries scan plain strings, not objects
+    _urls: Deque[str] = field(default_factory=deque, repr=False)
+    _methods: Deque[str] = field(default_factory=deque, repr=False)
+    
+    def __post_init__(self):
+        self._set_columns(self.requests, self._max_memory_requests)
+    
+    def _set_columns(self, requests, maxlen: int):
+        """(Re)build the bounded row store and its column views."""
+        # Bounded: appending past the cap evicts the oldest in O(1), and the
+        # shared maxlen keeps all three deques evicting in lockstep
+        self.requests = deque(requests, maxlen=maxlen)
+        self._urls = deque((r.url for r in self.requests), maxlen=maxlen)
+        self._methods = deque((_verb(r.method) for r in self.requests), maxlen=maxlen)
+    
+    def _select(self, mask) -> List[NetworkRequest]:
+        """Rows whose column mask is true; objects are touched only on a hit."""
+        return list(itertools.compress(self.requests, mask))
     
     def get_by_url(self, pattern: str) -> List[NetworkRequest]:
         """Get requests matching URL pattern."""
-        return [r for r in self.requests if pattern in r.url]
+        return self._select([pattern in u for u in self._urls])
     
     def get_by_method(self, method: str) -> List[NetworkRequest]:
         """Get requests by HTTP method."""
-        return [r for r in self.requests if r.method.upper() == method.upper()]
+        method = _verb(method)
+        return self._select([m == method for m in self._methods])
     
     def get_api_calls(self) -> List[NetworkRequest]:
         """Get likely API calls (XHR/fetch)."""
-        api_patterns = ["/api", "/ajax", "/graphql", ".json", "xhr"]
-        return [r for r in self.requests 
-                if any(p in r.url.lower() for p in api_patterns)]
+        search = _API_RE.search
+        return self._select([search(u) is not None for u in self._urls])
     
     def get_form_posts(self) -> List[NetworkRequest]:
         """Get form submission POST requests."""
@@ -54,25 +126,26 @@ class NetworkLog:
         
         Use this for long-running monitoring - keeps context light.
         """
-        mode = "a" if append else "w"
-        self._file_handle = open(path, mode)
+        mode = "ab" if append else "wb"
+        # Records coalesce in the C-level buffer; writes reach the fd in
+        # large batches rather than once per request
+        self._file_handle = open(path, mode, buffering=self._stream_buffer)
         self._stream_to_file = True
         
         # Write header if new file
         if not append:
-            self._file_handle.write('{"requests": [\n')
+            self._file_handle.write(b'{"requests": [\n')
         elif append:
             self._file_handle.seek(0, 2)  # End of file
             # Check if needs comma
             if self._file_handle.tell() > 10:
-                self._file_handle.write(',\n')
+                self._file_handle.write(b',\n')
     
     def _add_request(self, req: NetworkRequest):
         """Add request with memory management."""
         if self._stream_to_file and self._file_handle:
             # Write directly to file
-            import json
-            self._file_handle.write(json.dumps({
+            self._file_handle.write(_dumps({
                 "id": req.id,
                 "url": req.url,
                 "method": req.method,
@@ -83,37 +156,47 @@ class NetworkLog:
                 "response_body": req.response_body[:1000] if req.response_body else None,
                 "response_headers": req.response_headers,
                 "duration_ms": req.duration_ms,
-            }))
-            self._file_handle.write(',\n')
-            self._file_handle.flush()
+            }) + b',\n')
+            self._unflushed += 1
+            if self._unflushed >= self._flush_every:
+                self._file_handle.flush()
+                self._unflushed = 0
         else:
-            # In-memory with limit
+            # In-memory; the deques' maxlen drops the oldest
             self.requests.append(req)
-            if len(self.requests) > self._max_memory_requests:
-                # Remove oldest
-                self.requests.pop(0)
+            self._urls.append(req.url)
+            self._methods.append(_verb(req.method))
     
     def close(self):
         """Close file handle if streaming."""
         if self._file_handle:
-            self._file_handle.write(']}\n')
+            self._file_handle.write(b']}\n')
             self._file_handle.close()
             self._file_handle = None
     
     def set_max_memory(self, n: int):
         """Set max requests to keep in memory."""
         self._max_memory_requests = n
-        if len(self.requests) > n:
-            self.requests = self.requests[-n:]
+        self._set_columns(self.requests, n)
     
     def get_summary(self) -> Dict[str, Any]:
         """Get summary without full payloads - safe for context."""
+        endpoints = set()
+        domains = set()
+        http_urls = (u for u in self._urls if u.startswith(_HTTP_SCHEMES))
+        for url in itertools.islice(http_urls, 50):
+            parsed = _cached_urlparse(url)
+            endpoints.add(parsed.path)
+            domains.add(parsed.netloc)
+        
+        # Counts come straight off the columns; no request objects are read
+        search = _API_RE.search
         return {
             "total_requests": len(self.requests),
-            "api_calls": len(self.get_api_calls()),
-            "post_requests": len(self.get_form_posts()),
-            "endpoints": list(set(urlparse(r.url).path for r in self.requests[:50])),
-            "unique_domains": list(set(urlparse(r.url).netloc for r in self.requests[:50])),
+            "api_calls": sum(1 for u in self._urls if search(u)),
+            "post_requests": self._methods.count("POST"),
+            "endpoints": list(endpoints),
+            "unique_domains": list(domains),
         }
     
     def export_json(self, path: str):
@@ -139,8 +222,60 @@ class NetworkLog:
                 for r in self.requests
             ]
         }
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+
+
+# ============ Client templates ============
+# Static scaffolding for generate_client_code, built once per process
+
+_CLIENT_HEADER = '''"""Auto-generated API client from network capture."""
+import requests
+from urllib.parse import urljoin
+
+BASE_URL = ""  # Set this
+
+session = requests.Session()
+
+# Captured headers:
+headers = {
+    # Add headers from capture
+}
+
+'''
+
+_CLIENT_POST_BLOCK = '''
+def {name}(data: dict) -> requests.Response:
+    """{verb} {endpoint}"""
+    url = urljoin(BASE_URL, "{endpoint}")
+    return session.post(url, data=data, headers=headers)
+
+'''
+
+_CLIENT_GET_BLOCK = '''
+def {name}() -> dict:
+    """GET {endpoint}"""
+    url = urljoin(BASE_URL, "{endpoint}")
+    resp = session.get(url, headers=headers)
+    return resp.json()
+
+'''
+
+_CLIENT_MAIN = "\nif __name__ == '__main__':\n    pass\n"
+
+_NON_IDENT_RE = re.compile(r"\W+")
+
+
+def _client_method_name(url: str, default: str) -> str:
+    """Python identifier for a captured endpoint (``/api/v1/user-info`` -> ``api_v1_user_info``)."""
+    name = _NON_IDENT_RE.sub("_", _cached_urlparse(url).path).strip("_")
+    if not name:
+        return default
+    return f"_{name}" if name[0].isdigit() else name
 
 
 class NetworkMonitor:
@@ -159,37 +294,49 @@ class NetworkMonitor:
     def __init__(self):
         self.log = NetworkLog()
         self._request_id = 0
-        self._pending: Dict[str, NetworkRequest] = {}
+        # Playwright Request -> capture; keyed by identity, dropped with the request
+        self._pending: "weakref.WeakKeyDictionary[Any, NetworkRequest]" = weakref.WeakKeyDictionary()
         self._on_request: Callable[[NetworkRequest], None] = None
         self._on_response: Callable[[NetworkRequest], None] = None
     
+    def _make_request(self, request) -> NetworkRequest:
+        """Capture a Playwright request and register it as pending.
+        
+        Args:
+            request: Playwright Request
+        
+        Returns:
+            The new NetworkRequest, completed later by the response handler
+        """
+        req_id = f"req_{self._request_id}"
+        self._request_id += 1
+        
+        post_data = None
+        buffer = request.post_data_buffer  # Decoded from base64 on each access
+        if buffer:
+            try:
+                post_data = buffer.decode()
+            except UnicodeDecodeError:
+                pass
+        
+        # Playwright builds a fresh headers dict per access; no copy needed
+        network_req = NetworkRequest(
+            id=req_id,
+            url=request.url,
+            method=_verb(request.method),
+            headers=request.headers,
+            post_data=post_data,
+        )
+        
+        self._pending[request] = network_req
+        return network_req
+    
     def handler(self):
         """Get Playwright route handler."""
         from playwright.sync_api import Route, Request
         
         def handle(route: Route):
-            request = route.request
-            
-            # Create request log
-            req_id = f"req_{self._request_id}"
-            self._request_id += 1
-            
-            post_data = None
-            if request.post_data_buffer:
-                try:
-                    post_data = request.post_data_buffer.decode()
-                except:
-                    pass
-            
-            network_req = NetworkRequest(
-                id=req_id,
-                url=request.url,
-                method=request.method,
-                headers=dict(request.headers),
-                post_data=post_data,
-            )
-            
-            self._pending[req_id] = network_req
+            self._make_request(route.request)
             
             # Continue request
             route.continue_()
@@ -201,31 +348,26 @@ class NetworkMonitor:
         from playwright.sync_api import Response, Request
         
         def handle(response: Response):
-            request = response.request
-            req_id = None
-            
-            # Find matching request
-            for rid, req in self._pending.items():
-                if req.url == request.url:
-                    req_id = rid
-                    break
+            req = self._pending.pop(response.request, None)
             
-            if req_id and req_id in self._pending:
-                req = self._pending.pop(req_id)
+            if req is not None:
                 req.response_status = response.status
-                req.response_headers = dict(response.headers)
+                req.response_headers = response.headers
                 req.duration_ms = (time.time() - req.timestamp) * 1000
                 
-                # Try to get body (limited for large responses)
-                try:
-                    body = response.body()
-                    if len(body) < 100000:  # Skip large responses
-                        try:
-                            req.response_body = body.decode("utf-8")
-                        except:
-                            req.response_body = body.hex()
-                except:
-                    pass
+                # Try to get body (limited for large responses); a declared
+                # Content-Length over the limit skips fetching it at all, as do
+                # responses that have no body (the fetch would only error)
+                length = req.response_headers.get("content-length", "")
+                if _has_body(req.method, response.status) and not (length.isdigit() and int(length) >= 100000):
+                    try:
+                        body = response.body()
+                        if len(body) < 100000:  # Skip large responses
+                            # One pass; binary bytes become U+FFFD rather than
+                            # raising and re-encoding the whole body as hex
+                            req.response_body = body.decode("utf-8", errors="replace")
+                    except:
+                        pass
                 
                 self.log._add_request(req)
                 
@@ -239,25 +381,7 @@ class NetworkMonitor:
         from playwright.sync_api import Request
         
         def handle(request: Request):
-            req_id = f"req_{self._request_id}"
-            self._request_id += 1
-            
-            post_data = None
-            if request.post_data_buffer:
-                try:
-                    post_data = request.post_data_buffer.decode()
-                except:
-                    pass
-            
-            network_req = NetworkRequest(
-                id=req_id,
-                url=request.url,
-                method=request.method,
-                headers=dict(request.headers),
-                post_data=post_data,
-            )
-            
-            self._pending[req_id] = network_req
+            network_req = self._make_request(request)
             
             if self._on_request:
                 self._on_request(network_req)
@@ -296,56 +420,24 @@ class NetworkMonitor:
         
         Analyzes captured requests and generates a client class.
         """
-        api_calls = self.log.get_api_calls()
-        posts = self.log.get_form_posts()
-        
-        code = '''"""Auto-generated API client from network capture."""
-import requests
-from urllib.parse import urljoin
-
-BASE_URL = ""  # Set this
-
-session = requests.Session()
-
-# Captured headers:
-headers = {
-    # Add headers from capture
-}
-
-'''
-        
-        # Generate methods for POST requests
-        for req in posts[:10]:
-            parsed = urlparse(req.url)
-            endpoint = parsed.path
-            method_name = endpoint.replace("/", "_").strip("_") or "submit"
-            
-            code += f'''
-def {method_name}(data: dict) -> requests.Response:
-    """{req.method} {endpoint}"""
-    url = urljoin(BASE_URL, "{endpoint}")
-    return session.post(url, data=data, headers=headers)
-
-'''
-        
-        # Generate API methods
-        for req in api_calls[:10]:
-            parsed = urlparse(req.url)
-            endpoint = parsed.path
-            method_name = endpoint.replace("/", "_").strip("_") or "api_call"
-            
-            code += f'''
-def {method_name}() -> dict:
-    """GET {endpoint}"""
-    url = urljoin(BASE_URL, "{endpoint}")
-    resp = session.get(url, headers=headers)
-    return resp.json()
-
-'''
+        # Skip data:/blob: captures before any URL parsing
+        api_calls = [r for r in self.log.get_api_calls() if r.url.startswith(_HTTP_SCHEMES)]
+        posts = [r for r in self.log.get_form_posts() if r.url.startswith(_HTTP_SCHEMES)]
         
-        code += "\nif __name == '__main__':\n    pass\n"
+        parts = [_CLIENT_HEADER]
+        parts.extend(
+            _CLIENT_POST_BLOCK.format(name=_client_method_name(req.url, "submit"), verb=req.method,
+                                      endpoint=_cached_urlparse(req.url).path)
+            for req in posts[:10]
+        )
+        parts.extend(
+            _CLIENT_GET_BLOCK.format(name=_client_method_name(req.url, "api_call"),
+                                     endpoint=_cached_urlparse(req.url).path)
+            for req in api_calls[:10]
+        )
+        parts.append(_CLIENT_MAIN)
         
-        return code
+        return "".join(parts)
 
 
 # Extend StealthBrowser with network monitoring
@@ -7,11 +7,26 @@ import os
 import sys
 import json
 import time
+import asyncio
 import argparse
+import functools
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from urllib.parse import urlsplit
+
+from .utils import DATACLASS_SLOTS, KeyedRateLimiter
+
+# Optional: orjson for JSONL item output
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# BeautifulSoup tree builder; lxml is much faster than html.parser
+_PARSER = "lxml"
 
 
 @dataclass
@@ -22,7 +37,7 @@ class ScrapedItem:
     timestamp: float
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ScrapeJob:
     """Scraping job configuration."""
     name: str
@@ -32,6 +47,69 @@ class ScrapeJob:
     rate_limit: float = 1.0  # seconds between requests
     output_dir: str = "./scraped_data"
     proxy: str = None
+    concurrency: int = 4  # Max pages in flight (AsyncBackgroundScraper)
+
+
+def _text_prefix(elem, limit: int) -> str:
+    """``elem.get_text(strip=True)[:limit]`` without walking past the limit."""
+    parts = []
+    n = 0
+    for s in elem.stripped_strings:
+        parts.append(s)
+        n += len(s)
+        if n >= limit:
+            break
+    return "".join(parts)[:limit]
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_selectors(selector: str, fields: Tuple[Tuple[str, str], ...]):
+    """Compile a job's item and field selectors once; pages reuse the result."""
+    import soupsieve
+    
+    return soupsieve.compile(selector), [(name, soupsieve.compile(sel)) for name, sel in fields]
+
+
+def extract_items(html: str, job: ScrapeJob, page: int) -> List[Dict[str, Any]]:
+    """Extract items from one listing page according to ``job.config``.
+    
+    Returns:
+        List of item dicts (empty when the selector matches nothing)
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, features=_PARSER)
+    
+    # Extract items based on config; selectors are compiled once per job
+    selector, fields = _compile_selectors(
+        job.config.get("selector", ".item"),
+        tuple((f["name"], f["selector"]) for f in job.config.get("fields", [])),
+    )
+    
+    items = []
+    for i, elem in enumerate(selector.select(soup)):
+        item = {
+            "page": page,
+            "position": i,
+            "html": str(elem)[:5000],  # Limit size
+            "text": _text_prefix(elem, 2000),
+        }
+        
+        # Extract specific fields if configured
+        for name, field_selector in fields:
+            field_elem = field_selector.select_one(elem)
+            item[name] = field_elem.get_text(strip=True) if field_elem else None
+        
+        items.append(item)
+    
+    return items
+
+
+def _jsonl(items: List[Dict[str, Any]]) -> bytes:
+    """Serialize items as JSON lines, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return b"".join(orjson.dumps(item) + b"\n" for item in items)
+    return "".join(json.dumps(item) + "\n" for item in items).encode("utf-8")
 
 
 class BackgroundScraper:
@@ -63,7 +141,6 @@ class BackgroundScraper:
             Path to results directory
         """
         from webagent import StealthClient
-        from bs4 import BeautifulSoup
         
         # Setup output
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -93,6 +170,12 @@ class BackgroundScraper:
         items_scraped = 0
         errors = []
         
+        # One handle for the whole job; each page lands as a single write
+        items_fh = open(items_file, "ab", buffering=1 << 20)
+        
+        # Pagination separator is fixed by the base URL
+        sep = "&" if "?" in job.url else "?"
+        
         try:
             for page in range(1, job.max_pages + 1):
                 # Rate limit
@@ -102,47 +185,22 @@ class BackgroundScraper:
                 
                 last_request = time.time()
                 
-                # Build URL
-                page_url = job.url
-                if "?" in page_url:
-                    page_url += f"&page={page}"
-                else:
-                    page_url += f"?page={page}"
-                
                 try:
-                    resp = client.get(page_url)
+                    resp = client.get(f"{job.url}{sep}page={page}")
                     resp.raise_for_status()
                     
-                    soup = BeautifulSoup(resp.text, "html.parser")
-                    
-                    # Extract items based on config
-                    selector = job.config.get("selector", ".item")
-                    elements = soup.select(selector)
+                    items = extract_items(resp.text, job, page)
                     
-                    if not elements:
+                    if not items:
                         # Try to find pagination
                         break
                     
-                    for i, elem in enumerate(elements):
-                        item = {
-                            "page": page,
-                            "position": i,
-                            "html": str(elem)[:5000],  # Limit size
-                            "text": elem.get_text(strip=True)[:2000],
-                        }
-                        
-                        # Extract specific fields if configured
-                        for field in job.config.get("fields", []):
-                            field_elem = elem.select_one(field["selector"])
-                            item[field["name"]] = field_elem.get_text(strip=True) if field_elem else None
-                        
-                        # Save to JSONL
-                        with open(items_file, "a") as f:
-                            f.write(json.dumps(item) + "\n")
-                        
-                        items_scraped += 1
+                    # Save to JSONL; flushed per page so progress is visible on disk
+                    items_fh.write(_jsonl(items))
+                    items_fh.flush()
+                    items_scraped += len(items)
                     
-                    print(f"Page {page}: {len(elements)} items")
+                    print(f"Page {page}: {len(items)} items")
                     
                 except Exception as e:
                     error = {"page": page, "error": str(e)}
@@ -166,6 +224,8 @@ class BackgroundScraper:
         except KeyboardInterrupt:
             meta["status"] = "interrupted"
             meta["items_scraped"] = items_scraped
+        finally:
+            items_fh.close()
         
         # Write metadata
         with open(meta_file, "w") as f:
@@ -176,12 +236,143 @@ class BackgroundScraper:
         return job_dir
 
 
+class AsyncBackgroundScraper:
+    """Run scraping jobs with concurrent page fetches on one event loop.
+    
+    Pages are downloaded through an httpx.AsyncClient (HTTP/2 when
+    available, so one connection per host is multiplexed) and parsed in a
+    worker thread so parsing never stalls in-flight downloads. Output has
+    the same layout as BackgroundScraper.
+    
+    Usage:
+        scraper = AsyncBackgroundScraper()
+        asyncio.run(scraper.run(job))
+        
+        # Several jobs at once
+        asyncio.run(scraper.run_many([job1, job2]))
+    """
+    
+    def __init__(self, output_dir: str = "./scraped_data"):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+    
+    async def run_many(self, jobs: List[ScrapeJob]) -> List[Path]:
+        """Run several jobs concurrently.
+        
+        Returns:
+            Result directories, in job order
+        """
+        return list(await asyncio.gather(*(self.run(job) for job in jobs)))
+    
+    async def run(self, job: ScrapeJob) -> Path:
+        """Run scraping job and save results.
+        
+        Up to ``job.concurrency`` pages are in flight at once while requests
+        to the same host stay spaced by ``job.rate_limit`` seconds.
+        
+        Returns:
+            Path to results directory
+        """
+        from webagent import StealthClient
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        job_dir = self.output_dir / job.name / timestamp
+        job_dir.mkdir(parents=True, exist_ok=True)
+        
+        meta = {
+            "name": job.name,
+            "url": job.url,
+            "started_at": timestamp,
+            "max_pages": job.max_pages,
+            "config": job.config,
+        }
+        
+        client = StealthClient()
+        if job.proxy:
+            client.config.proxy = job.proxy
+        
+        loop = asyncio.get_running_loop()
+        limiter = KeyedRateLimiter(1, job.rate_limit) if job.rate_limit > 0 else None
+        sem = asyncio.Semaphore(max(1, job.concurrency))
+        host = urlsplit(job.url).netloc
+        sep = "&" if "?" in job.url else "?"
+        # First page known to be empty or failed fatally; later pages are skipped
+        state = {"stop_at": job.max_pages + 1}
+        
+        async def fetch_page(http, page: int):
+            async with sem:
+                if page >= state["stop_at"]:
+                    return page, None, None
+                
+                if limiter:
+                    await asyncio.sleep(limiter.reserve(host))
+                
+                try:
+                    resp = await http.get(f"{job.url}{sep}page={page}")
+                    resp.raise_for_status()
+                    items = await loop.run_in_executor(None, extract_items, resp.text, job, page)
+                except Exception as e:
+                    print(f"Page {page} error: {e}")
+                    if job.config.get("stop_on_error"):
+                        state["stop_at"] = min(state["stop_at"], page)
+                    return page, None, {"page": page, "error": str(e)}
+                
+                if not items:
+                    state["stop_at"] = min(state["stop_at"], page)
+                else:
+                    print(f"Page {page}: {len(items)} items")
+                return page, items, None
+        
+        try:
+            async with client.async_client() as http:
+                results = await asyncio.gather(
+                    *(fetch_page(http, page) for page in range(1, job.max_pages + 1))
+                )
+        finally:
+            client.close()
+        
+        # Write in page order, up to the first empty page
+        items_scraped = 0
+        pages_completed = 0
+        errors = []
+        with open(job_dir / "items.jsonl", "ab", buffering=1 << 20) as f:
+            for page, items, error in results:
+                if page > state["stop_at"]:
+                    break
+                pages_completed = page
+                if error:
+                    errors.append(error)
+                    continue
+                if not items:
+                    break
+                f.write(_jsonl(items))
+                items_scraped += len(items)
+        
+        meta.update({
+            "completed_at": datetime.now().isoformat(),
+            "items_scraped": items_scraped,
+            "pages_completed": pages_completed,
+            "errors": errors[:10],  # Keep first 10 errors
+            "status": "completed" if items_scraped > 0 else "failed",
+        })
+        
+        with open(job_dir / "metadata.json", "w") as f:
+            json.dump(meta, f, indent=2)
+        
+        print(f"\nDone! Scraped {items_scraped} items to {job_dir}")
+        
+        return job_dir
+
+
 def run_cli():
     """CLI entry point for background scraping.
     
     Usage:
         python -m webagent.scrape --url https://site.com --name products \
-            --selector ".product" --pages 50 --rate-limit 2
+            --selector ".product" --pages 50 --rate-limit 2 --concurrency 4
+    
+    With --concurrency above 1 (and httpx installed) pages are fetched
+    concurrently by AsyncBackgroundScraper; otherwise one at a time.
     """
     parser = argparse.ArgumentParser(description="Background web scraper")
     parser.add_argument("--url", required=True, help="Base URL to scrape")
@@ -191,6 +382,7 @@ def run_cli():
     parser.add_argument("--rate-limit", type=float, default=1.0, help="Seconds between requests")
     parser.add_argument("--output", default="./scraped_data", help="Output directory")
     parser.add_argument("--proxy", help="Proxy URL")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max pages in flight (1 = sequential)")
     parser.add_argument("--field", action="append", help="Fields to extract (name:selector)")
     
     args = parser.parse_args()
@@ -214,10 +406,15 @@ def run_cli():
         rate_limit=args.rate_limit,
         output_dir=args.output,
         proxy=args.proxy,
+        concurrency=args.concurrency,
     )
     
-    scraper = BackgroundScraper(output_dir=args.output)
-    result_dir = scraper.run(job)
+    from .http import HTTPX_AVAILABLE
+    
+    if job.concurrency > 1 and HTTPX_AVAILABLE:
+        result_dir = asyncio.run(AsyncBackgroundScraper(output_dir=args.output).run(job))
+    else:
+        result_dir = BackgroundScraper(output_dir=args.output).run(job)
     
     print(f"\nResults: {result_dir}")
 
@@ -238,6 +435,7 @@ def scrape_background(url: str, name: str, **kwargs) -> str:
         rate_limit=kwargs.get("rate_limit", 1.0),
         output_dir=kwargs.get("output_dir", "./scraped_data"),
         proxy=kwargs.get("proxy"),
+        concurrency=kwargs.get("concurrency", 4),
     )
     
     # Save job config
@@ -3,14 +3,56 @@ import os
 import json
 import time
 import re
+import asyncio
+import hashlib
+import importlib.util
+import itertools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import quote_plus, urljoin
 from dataclasses import dataclass, field
 
+from .utils import DATACLASS_SLOTS, Cache, response_json
 
-@dataclass
+# Optional: ijson streams the result array out of large API responses
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Optional: httpx for async search (HTTP/2 needs the h2 extra)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Optional: selectolax (lexbor) - fastest parser for DuckDuckGo HTML results
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# BeautifulSoup tree builder; lxml is much faster than html.parser
+_PARSER = "lxml"
+
+# Results shared by every backend instance, keyed by SHA-256 of provider|query|num
+_search_cache = Cache(ttl=3600, max_size=1024)
+
+_CACHE_MODES = ("enabled", "read-only", "disabled", "replay")
+
+# DuckDuckGo HTML result links: <a class="result__a" href="...">title</a>
+_DDG_LINK_RE = re.compile(r'<a class="result__a" href="([^"]+)"[^>]*>([^<]+)</a>')
+
+
+@dataclass(**DATACLASS_SLOTS)
 class SearchResult:
     """Represents a single search result."""
     title: str
@@ -22,17 +64,189 @@ class SearchResult:
 
 
 class SearchBackend(ABC):
-    """Abstract base class for search backends."""
+    """Abstract base class for search backends.
+    
+    Subclasses implement ``_do_search``; ``search`` puts the shared result
+    cache in front of it. ``async_search`` runs ``_do_search`` in a worker
+    thread; JSON API backends override that with a native httpx request. Use
+    the async methods from one event loop and ``await backend.aclose()`` when
+    done.
+    """
+    
+    source: str = ""  # Provider name, part of the cache key
+    _session: Optional[requests.Session] = None
+    _client: Optional["httpx.AsyncClient"] = None
+    
+    @abstractmethod
+    def _do_search(self, query: str, num: int) -> List[SearchResult]:
+        """Query the provider, bypassing the cache."""
+        pass
+    
+    async def _async_do_search(self, query: str, num: int) -> List[SearchResult]:
+        """Query the provider without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._do_search, query, num)
+    
+    def _cached(self, query: str, num: int, cache: str) -> Tuple[bytes, Optional[List[SearchResult]]]:
+        """Return (cache key, cached results or None) for a query."""
+        if cache not in _CACHE_MODES:
+            raise ValueError(f"cache must be one of {_CACHE_MODES}, got {cache!r}")
+        key = hashlib.sha256(f"{self.source}|{query}|{num}".encode()).digest()
+        if cache == "disabled":
+            return key, None
+        results = _search_cache.get(key)
+        if results is None and cache == "replay":
+            raise LookupError(f"No cached {self.source} results for {query!r}")
+        return key, results
+    
+    def search(self, query: str, num: int = 10, cache: str = "enabled") -> List[SearchResult]:
+        """Perform search and return results.
+        
+        Args:
+            query: Search query
+            num: Number of results
+            cache: "enabled" (serve and store), "read-only" (serve hits, store
+                nothing), "disabled" (always query the provider) or "replay"
+                (serve from cache only; a miss raises LookupError)
+        
+        Returns:
+            List of SearchResult objects
+        """
+        key, results = self._cached(query, num, cache)
+        if results is None:
+            results = self._do_search(query, num)
+            if cache == "enabled":
+                _search_cache.set(key, results)
+        return list(results)
+    
+    async def async_search(self, query: str, num: int = 10, cache: str = "enabled") -> List[SearchResult]:
+        """Perform search without blocking the event loop (see ``search``)."""
+        key, results = self._cached(query, num, cache)
+        if results is None:
+            results = await self._async_do_search(query, num)
+            if cache == "enabled":
+                _search_cache.set(key, results)
+        return list(results)
+    
+    async def async_search_many(
+        self,
+        queries: List[str],
+        num: int = 10,
+        concurrency: int = 10,
+        cache: str = "enabled",
+    ) -> List[List[SearchResult]]:
+        """Run several searches concurrently.
+        
+        Args:
+            queries: Search queries
+            num: Number of results per query
+            concurrency: Max searches in flight
+            cache: Cache mode, as for ``search``
+        
+        Returns:
+            One result list per query, in order
+        """
+        sem = asyncio.Semaphore(max(1, concurrency))
+        
+        async def bounded(query: str) -> List[SearchResult]:
+            async with sem:
+                return await self.async_search(query, num, cache)
+        
+        return list(await asyncio.gather(*(bounded(q) for q in queries)))
+    
+    def _http(self) -> requests.Session:
+        """Keep-alive session, created on first use; queries reuse its TLS connections."""
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                max_retries=Retry(total=3, backoff_factor=0.3),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+    
+    def close(self):
+        """Close the keep-alive session, if one was created."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _async_client(self) -> "httpx.AsyncClient":
+        """Shared AsyncClient, created on first use so its pool is reused."""
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is not available. Install: pip install 'httpx[http2]'")
+        if self._client is None:
+            self._client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, timeout=30)
+        return self._client
+    
+    async def aclose(self):
+        """Close the async client, if one was created."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class _JSONSearchBackend(SearchBackend):
+    """Backend for a JSON search API: one GET per query, shared by sync and async.
+    
+    With ijson installed, sync searches stream items from large responses
+    and stop building objects after ``num``; the rest of the body is read
+    and discarded so the connection returns to the pool.
+    """
+    
+    _items_path = ""  # Dotted path to the result array in the response
+    _stream_min_bytes = 256 * 1024  # Declared sizes below this are decoded whole
     
     @abstractmethod
-    def search(self, query: str, num: int = 10) -> List[SearchResult]:
-        """Perform search and return results."""
+    def _request(self, query: str, num: int) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """Return (url, params, headers) for a query."""
         pass
+    
+    @abstractmethod
+    def _result(self, i: int, item: Dict[str, Any]) -> SearchResult:
+        """Convert the i-th result item of the response."""
+        pass
+    
+    def _parse(self, data: Dict[str, Any], num: int) -> List[SearchResult]:
+        """Convert a decoded API response to at most num results."""
+        items = data
+        for key in self._items_path.split("."):
+            items = items.get(key) if isinstance(items, dict) else None
+        return [self._result(i, item) for i, item in enumerate(itertools.islice(items or (), num))]
+    
+    def _do_search(self, query: str, num: int) -> List[SearchResult]:
+        url, params, headers = self._request(query, num)
+        with self._http().get(url, params=params, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            length = response.headers.get("Content-Length", "")
+            if not IJSON_AVAILABLE or (length.isdigit() and int(length) < self._stream_min_bytes):
+                return self._parse(response_json(response), num)
+            
+            response.raw.decode_content = True  # ijson reads raw; undo gzip/br
+            items = ijson.items(response.raw, f"{self._items_path}.item", use_float=True)
+            results = [self._result(i, item) for i, item in enumerate(itertools.islice(items, num))]
+            # Read to EOF so urllib3 releases the connection to the pool
+            # instead of closing it with the unread remainder
+            while response.raw.read(1 << 16):
+                pass
+            return results
+    
+    async def _async_do_search(self, query: str, num: int) -> List[SearchResult]:
+        url, params, headers = self._request(query, num)
+        response = await self._async_client().get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return self._parse(response_json(response), num)
 
 
-class GoogleCustomSearch(SearchBackend):
+class GoogleCustomSearch(_JSONSearchBackend):
     """Google Custom Search JSON API (free 100/day)."""
     
+    source = "google_cs"
+    _items_path = "items"
+    
     def __init__(self, api_key: str = None, cx: str = None):
         self.api_key = api_key or os.getenv("GOOGLE_CS_API_KEY")
         self.cx = cx or os.getenv("GOOGLE_CS_CX")
@@ -40,74 +254,64 @@ class GoogleCustomSearch(SearchBackend):
         if not self.api_key or not self.cx:
             raise ValueError("Google CS API key and CX required. Set GOOGLE_CS_API_KEY and GOOGLE_CS_CX")
     
-    def search(self, query: str, num: int = 10) -> List[SearchResult]:
-        url = "https://www.googleapis.com/customsearch/v1"
+    def _request(self, query: str, num: int) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
         params = {
             "key": self.api_key,
             "cx": self.cx,
             "q": query,
             "num": min(num, 10)  # Max 10 per request
         }
-        
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        results = []
-        for i, item in enumerate(data.get("items", [])):
-            results.append(SearchResult(
-                title=item.get("title", ""),
-                url=item.get("link", ""),
-                snippet=item.get("snippet", ""),
-                position=i + 1,
-                source="google_cs",
-                extra={
-                    "displayLink": item.get("displayLink"),
-                    "mime": item.get("mime"),
-                    "fileFormat": item.get("fileFormat"),
-                }
-            ))
-        
-        return results
+        return "https://www.googleapis.com/customsearch/v1", params, {}
+    
+    def _result(self, i: int, item: Dict[str, Any]) -> SearchResult:
+        return SearchResult(
+            title=item.get("title", ""),
+            url=item.get("link", ""),
+            snippet=item.get("snippet", ""),
+            position=i + 1,
+            source="google_cs",
+            extra={
+                "displayLink": item.get("displayLink"),
+                "mime": item.get("mime"),
+                "fileFormat": item.get("fileFormat"),
+            }
+        )
 
 
-class SerpAPI(SearchBackend):
+class SerpAPI(_JSONSearchBackend):
     """SerpAPI - paid Google results with no blocking."""
     
+    source = "serpapi"
+    _items_path = "organic_results"
+    
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv("SERPAPI_KEY")
         
         if not self.api_key:
             raise ValueError("SerpAPI key required. Set SERPAPI_KEY")
     
-    def search(self, query: str, num: int = 10) -> List[SearchResult]:
+    def _request(self, query: str, num: int) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
         params = {
             "api_key": self.api_key,
             "q": query,
             "num": num,
             "engine": "google"
         }
-        
-        response = requests.get("https://serpapi.com/search", params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        results = []
-        for i, item in enumerate(data.get("organic_results", [])):
-            results.append(SearchResult(
-                title=item.get("title", ""),
-                url=item.get("link", ""),
-                snippet=item.get("snippet", ""),
-                position=i + 1,
-                source="serpapi",
-                extra={
-                    "position": item.get("position"),
-                    "rating": item.get("rating"),
-                    "extensions": item.get("extensions", []),
-                }
-            ))
-        
-        return results
+        return "https://serpapi.com/search", params, {}
+    
+    def _result(self, i: int, item: Dict[str, Any]) -> SearchResult:
+        return SearchResult(
+            title=item.get("title", ""),
+            url=item.get("link", ""),
+            snippet=item.get("snippet", ""),
+            position=i + 1,
+            source="serpapi",
+            extra={
+                "position": item.get("position"),
+                "rating": item.get("rating"),
+                "extensions": item.get("extensions", []),
+            }
+        )
 
 
 class DuckDuckGoSearch(SearchBackend):
@@ -117,8 +321,11 @@ class DuckDuckGoSearch(SearchBackend):
     we recommend using SerpAPI, Google Custom Search API, or Bing API.
     """
     
+    source = "duckduckgo"
+    
     def __init__(self):
         self.base_url = "https://duckduckgo.com/"
+        self._token: Optional[str] = None  # "kl" cookie, fetched once per instance
         try:
             from bs4 import BeautifulSoup
             self.has_bs4 = True
@@ -130,11 +337,9 @@ class DuckDuckGoSearch(SearchBackend):
         results = []
         
         # Very rough regex parsing
-        # Match result links: <a class="result__a" href="...">title</a>
-        link_pattern = re.compile(r'<a class="result__a" href="([^"]+)"[^>]*>([^<]+)</a>')
-        
-        for i, match in enumerate(link_pattern.findall(text)[:num]):
-            url, title = match
+        # finditer + islice stops scanning after num matches
+        for i, match in enumerate(itertools.islice(_DDG_LINK_RE.finditer(text), num)):
+            url, title = match.groups()
             # Try to get snippet
             snippet = ""
             results.append(SearchResult(
@@ -148,12 +353,34 @@ class DuckDuckGoSearch(SearchBackend):
         
         return results
     
+    def _parse_html_selectolax(self, text: str, num: int) -> List[SearchResult]:
+        """Parse HTML with selectolax's lexbor parser."""
+        results = []
+        tree = LexborHTMLParser(text)
+        
+        for i, result in enumerate(tree.css(".result")[:num]):
+            title_elem = result.css_first(".result__title")
+            link_elem = result.css_first(".result__url")
+            snippet_elem = result.css_first(".result__snippet")
+            
+            if title_elem and link_elem:
+                results.append(SearchResult(
+                    title=title_elem.text(strip=True),
+                    url=link_elem.text(strip=True),
+                    snippet=snippet_elem.text(strip=True) if snippet_elem else "",
+                    position=i + 1,
+                    source="duckduckgo",
+                    extra={}
+                ))
+        
+        return results
+    
     def _parse_html_bs4(self, text: str, num: int) -> List[SearchResult]:
         """Parse HTML with BeautifulSoup."""
         from bs4 import BeautifulSoup
         
         results = []
-        soup = BeautifulSoup(text, "html.parser")
+        soup = BeautifulSoup(text, features=_PARSER)
         
         for i, result in enumerate(soup.select(".result")[:num]):
             title_elem = result.select_one(".result__title")
@@ -172,15 +399,17 @@ class DuckDuckGoSearch(SearchBackend):
         
         return results
     
-    def search(self, query: str, num: int = 10) -> List[SearchResult]:
+    def _do_search(self, query: str, num: int) -> List[SearchResult]:
         # Use the HTML endpoint for more results
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
         
-        # First get the token
-        resp = requests.post(self.base_url, data={"q": query}, headers=headers, timeout=10)
-        token = resp.cookies.get("kl")
+        # First get the token; later queries reuse it and skip the round trip
+        if self._token is None:
+            resp = self._http().post(self.base_url, data={"q": query}, headers=headers, timeout=10)
+            self._token = resp.cookies.get("kl")
+        token = self._token
         
         # Then search
         params = {
@@ -193,7 +422,7 @@ class DuckDuckGoSearch(SearchBackend):
             params["kl"] = token
         
         try:
-            response = requests.get(
+            response = self._http().get(
                 "https://lite.duckduckgo.com/lite/",
                 params=params,
                 headers=headers,
@@ -207,7 +436,7 @@ class DuckDuckGoSearch(SearchBackend):
         results = []
         # Parse the JSON response
         try:
-            data = response.json()
+            data = response_json(response)
             for i, item in enumerate(data.get("results", [])[:num]):
                 results.append(SearchResult(
                     title=item.get("title", ""),
@@ -226,22 +455,27 @@ class DuckDuckGoSearch(SearchBackend):
     
     def _search_html_fallback(self, query: str, num: int, headers: dict) -> List[SearchResult]:
         """Direct HTML scraping fallback."""
-        response = requests.get(
+        response = self._http().get(
             f"https://html.duckduckgo.com/html/?q={quote_plus(query)}",
             headers=headers,
             timeout=10
         )
         response.raise_for_status()
         
-        if self.has_bs4:
+        if SELECTOLAX_AVAILABLE:
+            return self._parse_html_selectolax(response.text, num)
+        elif self.has_bs4:
             return self._parse_html_bs4(response.text, num)
         else:
             return self._parse_html_fallback(response.text, num)
 
 
-class BingSearch(SearchBackend):
+class BingSearch(_JSONSearchBackend):
     """Bing Search API."""
     
+    source = "bing"
+    _items_path = "webPages.value"
+    
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv("BING_API_KEY")
         self.endpoint = "https://api.bing.microsoft.com/v7.0/search"
@@ -249,29 +483,23 @@ class BingSearch(SearchBackend):
         if not self.api_key:
             raise ValueError("Bing API key required. Set BING_API_KEY")
     
-    def search(self, query: str, num: int = 10) -> List[SearchResult]:
+    def _request(self, query: str, num: int) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
         headers = {"Ocp-Apim-Subscription-Key": self.api_key}
         params = {"q": query, "count": min(num, 50), "mkt": "en-US"}
-        
-        response = requests.get(self.endpoint, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        results = []
-        for i, item in enumerate(data.get("webPages", {}).get("value", [])):
-            results.append(SearchResult(
-                title=item.get("name", ""),
-                url=item.get("url", ""),
-                snippet=item.get("snippet", ""),
-                position=i + 1,
-                source="bing",
-                extra={
-                    "displayUrl": item.get("displayUrl"),
-                    "dateLastCrawled": item.get("dateLastCrawled"),
-                }
-            ))
-        
-        return results
+        return self.endpoint, params, headers
+    
+    def _result(self, i: int, item: Dict[str, Any]) -> SearchResult:
+        return SearchResult(
+            title=item.get("name", ""),
+            url=item.get("url", ""),
+            snippet=item.get("snippet", ""),
+            position=i + 1,
+            source="bing",
+            extra={
+                "displayUrl": item.get("displayUrl"),
+                "dateLastCrawled": item.get("dateLastCrawled"),
+            }
+        )
 
 
 class GoogleSearch:
@@ -299,38 +527,114 @@ class GoogleSearch:
                 print(f"Warning: {e}. Falling back to DuckDuckGo.")
                 self.backend = DuckDuckGoSearch()
     
-    def search(self, query: str, num: int = 10) -> List[SearchResult]:
-        return self.backend.search(query, num)
+    def search(self, query: str, num: int = 10, cache: str = "enabled") -> List[SearchResult]:
+        return self.backend.search(query, num, cache)
+    
+    async def async_search(self, query: str, num: int = 10, cache: str = "enabled") -> List[SearchResult]:
+        return await self.backend.async_search(query, num, cache)
+    
+    async def async_search_many(self, queries: List[str], num: int = 10, concurrency: int = 10, cache: str = "enabled") -> List[List[SearchResult]]:
+        return await self.backend.async_search_many(queries, num, concurrency, cache)
+    
+    def close(self):
+        self.backend.close()
+    
+    async def aclose(self):
+        await self.backend.aclose()
+
+
+# Provider name -> backend class
+_BACKENDS = {
+    "serpapi": SerpAPI,
+    "bing": BingSearch,
+    "google_cs": GoogleCustomSearch,
+    "duckduckgo": DuckDuckGoSearch,
+}
+
+
+def _configured_providers() -> List[str]:
+    """API providers with credentials in the environment, best first."""
+    providers = []
+    if os.getenv("SERPAPI_KEY"):
+        providers.append("serpapi")
+    if os.getenv("GOOGLE_CS_API_KEY") and os.getenv("GOOGLE_CS_CX"):
+        providers.append("google_cs")
+    if os.getenv("BING_API_KEY"):
+        providers.append("bing")
+    return providers
 
 
 # Convenience function
-def search(query: str, provider: str = "auto", num: int = 10) -> List[SearchResult]:
+def search(query: str, provider: str = "auto", num: int = 10, cache: str = "enabled") -> List[SearchResult]:
     """Quick search function.
     
     Args:
         query: Search query
         provider: "google_cs", "serpapi", "bing", "duckduckgo", or "auto"
         num: Number of results
+        cache: "enabled", "read-only", "disabled" or "replay" (see SearchBackend.search)
     
     Returns:
         List of SearchResult objects
     """
     if provider == "auto":
         # Try to use best available
-        if os.getenv("SERPAPI_KEY"):
-            provider = "serpapi"
-        elif os.getenv("GOOGLE_CS_API_KEY") and os.getenv("GOOGLE_CS_CX"):
-            provider = "google_cs"
-        elif os.getenv("BING_API_KEY"):
-            provider = "bing"
-        else:
-            provider = "duckduckgo"
-    
-    if provider == "serpapi":
-        return SerpAPI().search(query, num)
-    elif provider == "bing":
-        return BingSearch().search(query, num)
-    elif provider == "google_cs":
-        return GoogleCustomSearch().search(query, num)
-    else:
-        return DuckDuckGoSearch().search(query, num)
+        provider = (_configured_providers() or ["duckduckgo"])[0]
+    
+    return _BACKENDS.get(provider, DuckDuckGoSearch)().search(query, num, cache)
+
+
+async def search_race(
+    query: str,
+    providers: Optional[List[str]] = None,
+    num: int = 10,
+    cache: str = "enabled",
+) -> List[SearchResult]:
+    """Query several providers at once and return the first non-empty result.
+    
+    Every provider raced is billed for the query, so this is opt-in; the
+    remaining requests are cancelled once one succeeds. Cancelling cannot
+    stop a sync backend (e.g. DuckDuckGo) already running in the executor:
+    its request still runs to completion in the background and its result
+    is discarded.
+    
+    Args:
+        query: Search query
+        providers: Provider names to race (default: every provider with
+            credentials in the environment, else DuckDuckGo)
+        num: Number of results
+        cache: Cache mode, as for SearchBackend.search
+    
+    Returns:
+        Results of the first provider to answer with any; empty if none did
+    
+    Raises:
+        The last provider error, if every provider failed
+    """
+    backends = [_BACKENDS[p]() for p in (providers or _configured_providers() or ["duckduckgo"])]
+    tasks = [asyncio.ensure_future(b.async_search(query, num, cache)) for b in backends]
+    error = None
+    failures = 0
+    
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                results = await next_done
+            except Exception as e:
+                error = e
+                failures += 1
+                continue
+            if results:
+                return results
+        
+        if failures == len(tasks) and error is not None:
+            raise error
+        return []
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*(b.aclose() for b in backends), return_exceptions=True)
+        # Sync backends searched in the executor hold a requests.Session
+        for b in backends:
+            b.close()